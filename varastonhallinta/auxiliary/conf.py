@@ -5,13 +5,24 @@
 """Configuration-related classes and functions."""
 
 import argparse
+import collections
 import importlib.resources
 import logging
 import logging.config
+import logging.handlers
+import multiprocessing.util
+import os
+import threading
+from queue import Full
 
 PROJECT_NAME = "varastonhallinta"
 VERSION = "1.1.0"  # semantic- or serialization-like versioning
-DB_VERSION = VERSION.split(".")[0]
+DB_VERSION = 7  # number of the latest script in auxiliary/migrations
+DEFAULT_PRAGMAS = {"journal_mode": "WAL",
+                   "synchronous": "NORMAL",
+                   "cache_size": "-65536",  # KiB
+                   "mmap_size": "268435456",
+                   "busy_timeout": "5000"}
 
 def parse_command_line_args() -> argparse.Namespace:
     """Define and parse command-line options."""
@@ -25,6 +36,13 @@ def parse_command_line_args() -> argparse.Namespace:
                 setattr(namespace, self.dest, coll_type(values))
         return CollectAsAction
 
+    def pragma(string: str) -> tuple:
+        """Split NAME=VALUE."""
+        name, sep, value = string.partition("=")
+        if not sep or not name.isidentifier():
+            raise argparse.ArgumentTypeError(f"invalid pragma: {string}")
+        return name, value
+
     class ClientOnlyAction(argparse.Action):
         """Custom action to set client_only and scheme values."""
         def __init__(self, *args, **kwargs):
@@ -42,13 +60,21 @@ def parse_command_line_args() -> argparse.Namespace:
 
     # Hidden options.
     parser.add_argument("--dev", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--profile", metavar="PATHNAME",
+                        help=argparse.SUPPRESS)  # directory for profiles
+    parser.add_argument("--profile-every", metavar="N", type=int, default=1,
+                        help=argparse.SUPPRESS)
+    parser.add_argument("--profile-route", metavar="REGEX",
+                        help=argparse.SUPPRESS)  # e.g. ^/products_json
 
     # Optional arguments section.
     parser.add_argument(
         "--database", metavar="PATHNAME",
         help="relative or absolute path to a database file (defaults to using "
              "an .sqlite3 file within user application data directory)")
-    parser.add_argument("--backup", metavar="PATHNAME", help="backup and exit")
+    parser.add_argument(
+        "--backup", metavar="PATHNAME",
+        help="backup and exit (compressed if PATHNAME ends with .gz or .zst)")
     mode_group = parser.add_mutually_exclusive_group()
     mode_group.add_argument(
         "--server-only", action="store_true", help="run in server mode")
@@ -63,6 +89,84 @@ def parse_command_line_args() -> argparse.Namespace:
         "--translogger", action="store_true", help="enable request logging")
     parser.add_argument(
         "--version", action="store_true", help="output version and exit")
+    parser.add_argument(
+        "--startup-timing", action="store_true",
+        help="log how long each startup phase takes")
+
+    # Database options section.
+    database_group = parser.add_argument_group("database options")
+    database_group.add_argument(
+        "--pragma", metavar="NAME=VALUE", type=pragma, action="append",
+        default=[], help="set an SQLite pragma on each server connection "
+                         "(repeatable; defaults: " + ", ".join(
+                             f"{k}={v}" for k, v in DEFAULT_PRAGMAS.items())
+                         + ")")
+    database_group.add_argument(
+        "--statement-cache", metavar="N", type=int, default=256,
+        help="prepared statements cached per connection "
+             "(default: %(default)s)")
+    database_group.add_argument(
+        "--changelog-database", metavar="PATHNAME",
+        help="keep the change log in a separate database file instead of "
+             "the main database")
+    database_group.add_argument(
+        "--changelog-retention", metavar="DAYS", type=int,
+        help="move change log entries older than DAYS into compressed "
+             "archive files once a day (default: keep all entries)")
+    database_group.add_argument(
+        "--changelog-archive", metavar="PATHNAME",
+        help="directory for change log archives (defaults to a "
+             "muutosloki directory next to the database)")
+    database_group.add_argument(
+        "--slow-query", metavar="MILLISECONDS", type=float,
+        help="log statements that take longer than MILLISECONDS with their "
+             "parameters and query plan (default: don't log)")
+
+    # Backup options section.
+    backup_group = parser.add_argument_group("backup options")
+    backup_group.add_argument(
+        "--backup-step", metavar="PAGES", type=int, default=1024,
+        help="database pages copied per step, -1 for all at once "
+             "(default: %(default)s)")
+    backup_group.add_argument(
+        "--backup-vacuum", action="store_true",
+        help="compact the backup with VACUUM INTO, in one step "
+             "(not with --backup-interval)")
+    backup_group.add_argument(
+        "--backup-verify", action="store_true",
+        help="check the backup with PRAGMA integrity_check")
+    backup_group.add_argument(
+        "--backup-interval", metavar="HOURS", type=float,
+        help="back up the database every HOURS while serving "
+             "(default: no scheduled backups)")
+    backup_group.add_argument(
+        "--backup-directory", metavar="PATHNAME",
+        help="directory for scheduled backups (defaults to a varmuuskopiot "
+             "directory next to the database)")
+    backup_group.add_argument(
+        "--backup-keep", metavar="N", type=int, default=7,
+        help="scheduled backups to keep (default: %(default)s)")
+
+    # Server options section.
+    server_group = parser.add_argument_group("server options")
+    server_group.add_argument(
+        "--workers", metavar="N", type=int, default=1,
+        help="server processes sharing the socket; crashed processes are "
+             "restarted (default: %(default)s)")
+    server_group.add_argument(
+        "--threads", metavar="N", type=int, default=6,
+        help="request threads per server process (default: %(default)s)")
+    server_group.add_argument(
+        "--connection-limit", metavar="N", type=int, default=100,
+        help="open connections per server process before new ones wait "
+             "(default: %(default)s)")
+    server_group.add_argument(
+        "--backlog", metavar="N", type=int, default=1024,
+        help="pending connections queued by the operating system "
+             "(default: %(default)s)")
+    server_group.add_argument(
+        "--channel-timeout", metavar="SECONDS", type=int, default=120,
+        help="close connections idle for SECONDS (default: %(default)s)")
 
     # Socket address section.
     socket_group = parser.add_argument_group(
@@ -99,30 +203,125 @@ def parse_command_line_args() -> argparse.Namespace:
         choices=("normal", "maximized", "fullscreen", "kiosk"),
         help="initial window mode "
              "(not all modes are supported by all runtimes)")
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.backup_vacuum and args.backup_interval is not None:
+        parser.error("--backup-vacuum can't be scheduled, as VACUUM INTO "
+                     "copies the database in one step")
+    args.pragmas = {**DEFAULT_PRAGMAS, **dict(args.pragma)}
+    return args
 
-def output_logger_configurer():
+def output_logger_configurer(loglevel=None):
     """Configure output logger."""
     with importlib.resources.path(__package__, "logging.ini") as config_file:
         logging.config.fileConfig(config_file, disable_existing_loggers=False)
+    if loglevel is not None:
+        logging.getLogger().setLevel(loglevel)
+
+class BatchingQueueHandler(logging.handlers.QueueHandler):
+    """Send records to a queue in batches from a background thread.
+
+    Emitting only appends to a bounded buffer, so a slow queue or
+    listener can't hold up the thread that logs. Records that don't fit
+    are dropped, and the number of dropped records is logged instead.
+    Warnings and errors are sent at once along with the buffered records,
+    as the process may be about to die, and the rest are sent on exit.
+    """
+
+    def __init__(self, queue, capacity=10000, batch_size=200, interval=0.1):
+        super().__init__(queue)
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.interval = interval
+        self._pid = None
+
+    def _start(self):
+        # Threads don't survive fork, so each process starts its own.
+        self._pid = os.getpid()
+        self._buffer = collections.deque()
+        self._dropped = 0
+        self._wakeup = threading.Event()
+        self._send_lock = threading.Lock()
+        threading.Thread(target=self._run, name="Log batcher",
+                         daemon=True).start()
+        # Run before the exit handler of a multiprocessing queue joins its
+        # feeder thread.
+        multiprocessing.util.Finalize(self, self.flush, exitpriority=10)
+
+    def enqueue(self, record):
+        if self._pid != os.getpid():
+            with self.lock:
+                if self._pid != os.getpid():
+                    self._start()
+        urgent = record.levelno >= logging.WARNING
+        if len(self._buffer) >= self.capacity and not urgent:
+            self._dropped += 1
+            return
+        self._buffer.append(record)
+        if urgent:
+            self.flush()
+        elif len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Send buffered records."""
+        if self._pid != os.getpid():
+            return
+        with self._send_lock:
+            while self._buffer or self._dropped:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                if self._dropped:
+                    batch.append(logging.makeLogRecord(dict(
+                        name=__name__, levelno=logging.WARNING,
+                        levelname="WARNING",
+                        msg=f"Dropped {self._dropped} log records.")))
+                    self._dropped = 0
+                try:
+                    self.queue.put_nowait(batch)
+                except Full:
+                    self._dropped += len(batch)
+                    break
+
+    def close(self):
+        """Send buffered records and wait until they have left the process."""
+        self.flush()
+        if self._pid == os.getpid() and hasattr(self.queue, "join_thread"):
+            self.queue.close()
+            self.queue.join_thread()
+        super().close()
 
 def worker_logger_configurer(queue, loglevel):
     """Configure worker logger."""
-    handler = logging.handlers.QueueHandler(queue)
+    handler = BatchingQueueHandler(queue)
     root = logging.getLogger()
     root.addHandler(handler)
     root.setLevel(loglevel)
 
+def stop_listener(queue, listener):
+    """Send remaining records and command the listener to quit."""
+    for handler in logging.getLogger().handlers:
+        handler.flush()
+    queue.put(None)  # sentinel to tell the listener to quit
+    listener.join()
+
 def listener_process(queue):
     """Forward logging messages from queue to output logger."""
     output_logger_configurer()
     while True:
         try:
-            record = queue.get()
-            if record is None:  # sentinel to tell the listener to quit
+            batch = queue.get()
+            if batch is None:  # sentinel to tell the listener to quit
                 break
-            logger = logging.getLogger(record.name)
-            logger.handle(record)
+            for record in batch:
+                logger = logging.getLogger(record.name)
+                logger.handle(record)
         except Exception:
             import sys
             import traceback
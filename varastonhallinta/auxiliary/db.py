@@ -5,16 +5,33 @@
 """Database initialization."""
 
 import errno
+import gzip
+import hashlib
 import importlib.resources
 import logging
 import os
 import pathlib
 import sqlite3
+import time
+from collections import namedtuple
 import appdirs
 from auxiliary.conf import PROJECT_NAME, DB_VERSION
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+MIGRATIONS = f"{__package__}.migrations"
+
+COMPRESSION = {".gz": "gzip", ".zst": "zstd"}  # by destination suffix
+CHUNK_SIZE = 1024*1024
+MIB = 1024*1024
+
+Backup = namedtuple("Backup", "path size database_size seconds checksum")
+
 def ensure_user_data_dir() -> pathlib.Path:
     """Create user application data directory if it doesn't exist."""
     project_data_path = pathlib.Path(appdirs.user_data_dir(PROJECT_NAME))
@@ -43,7 +60,19 @@ def ensure_database(database: str) -> pathlib.Path:
                                     os.strerror(errno.ENOENT),
                                     str(database.parent))
         create_database(database)
+    else:
+        migrate_database(database)
+
+    return database
 
+def ensure_changelog_database(database: str) -> pathlib.Path:
+    """Create separate change log database if it doesn't exist."""
+    database = pathlib.Path(database).resolve()
+    logger.info(f"changelog database = {database}")
+    connection = sqlite3.connect(database)
+    connection.executescript(
+        importlib.resources.read_text(__package__, "muutosloki.sql"))
+    connection.close()
     return database
 
 def create_database(pathname: pathlib.Path):
@@ -53,20 +82,178 @@ def create_database(pathname: pathlib.Path):
         importlib.resources.read_text(__package__, "schema.sql"))
     connection.executescript(
         importlib.resources.read_text(__package__, "initial_data.sql"))
-    connection.execute(
-        "UPDATE Symbolit SET tietokannan_versio = ?", DB_VERSION)
+    connection.execute("UPDATE Symbolit SET tietokannan_versio = 1")
     connection.commit()
     connection.close()
+    migrate_database(pathname)
+
+def migrations() -> list:
+    """Return (version, script name) pairs of migrations in order."""
+    scripts = []
+    for name in importlib.resources.contents(MIGRATIONS):
+        number, _, suffix = name.partition("_")
+        if number.isdigit() and suffix.endswith(".sql"):
+            scripts.append((int(number), name))
+    return sorted(scripts)
+
+def migrate_database(pathname: pathlib.Path):
+    """Upgrade database schema to DB_VERSION one version at a time."""
+    connection = sqlite3.connect(pathname, isolation_level=None)
+    version = connection.execute(
+        "SELECT tietokannan_versio FROM Symbolit").fetchone()[0]
+    if version > DB_VERSION:
+        connection.close()
+        raise RuntimeError(f"Database version {version} is newer than "
+                           f"supported version {DB_VERSION}.")
+    pending = [(number, name) for number, name in migrations()
+               if version < number <= DB_VERSION]
+    for number, name in pending:
+        logger.info(f"Migrating database to version {number} ({name})...")
+        script = importlib.resources.read_text(MIGRATIONS, name)
+        try:
+            connection.executescript(
+                f"BEGIN;\n{script}\n"
+                f"UPDATE Symbolit SET tietokannan_versio = {number};\n"
+                f"COMMIT;")
+        except sqlite3.Error:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            connection.close()
+            raise
+    if pending:
+        logger.info("Analyzing database...")
+        connection.execute("ANALYZE")
+    connection.close()
+
+class _HashingWriter:
+    """File object that hashes what is written through it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.hash = hashlib.sha256()
+
+    def write(self, data):
+        self.hash.update(data)
+        return self.file.write(data)
+
+    def flush(self):
+        self.file.flush()
+
+def compressed_writer(file, compression):
+    """Wrap a binary file object to compress what is written to it."""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=file, mode="wb", compresslevel=6)
+    return zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(
+        file, closefd=False)
+
+def copy_database(connection: sqlite3.Connection, destination: pathlib.Path,
+                  step=1024, vacuum=False, progress=None, pause=0):
+    """Copy a consistent snapshot of a database to a new file.
+
+    With vacuum, the copy is compacted with VACUUM INTO instead of being
+    copied step pages at a time with the backup API. The progress
+    function is called with the numbers of copied and total pages, and
+    pause seconds are slept between steps to let other work proceed.
+    """
+    if vacuum:
+        connection.execute("VACUUM INTO ?", (str(destination),))
+        return
+
+    def between_steps(status, remaining, total):
+        if progress is not None:
+            progress(total - remaining, total)
+        if pause and remaining:
+            time.sleep(pause)
+
+    target = sqlite3.connect(destination)
+    try:
+        # A read transaction held across the steps keeps the snapshot
+        # stable, so commits by other connections don't restart the copy.
+        connection.execute("BEGIN")
+        connection.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        with target:
+            connection.backup(target, pages=step, progress=between_steps)
+    finally:
+        connection.rollback()
+        target.close()
+
+def write_backup(connection: sqlite3.Connection, destination, step=1024,
+                 vacuum=False, verify=False, progress=None,
+                 pause=0) -> Backup:
+    """Back up a database and write a checksum file next to the backup.
+
+    The backup is compressed with gzip or zstd if the destination ends
+    with .gz or .zst. With verify, the copy must pass PRAGMA
+    integrity_check before it replaces the destination.
+    """
+    destination = pathlib.Path(destination)
+    compression = COMPRESSION.get(destination.suffix)
+    if compression == "zstd" and zstandard is None:
+        raise RuntimeError("zstd compression requires the zstandard module")
+    snapshot = destination.with_name(destination.name + ".part")
+    temporary = destination.with_name(destination.name + ".tmp")
+    started = time.monotonic()
+    snapshot.unlink(missing_ok=True)
+    try:
+        copy_database(connection, snapshot, step, vacuum, progress, pause)
+        database_size = snapshot.stat().st_size
+        if verify:
+            check = sqlite3.connect(snapshot)
+            try:
+                result = [row[0] for row in
+                          check.execute("PRAGMA integrity_check")]
+            finally:
+                check.close()
+            if result != ["ok"]:
+                raise sqlite3.DatabaseError(
+                    "Backup failed integrity check: " + "; ".join(result))
+        if compression is None:
+            checksum = hashlib.sha256()
+            with open(snapshot, "rb") as f:
+                while chunk := f.read(CHUNK_SIZE):
+                    checksum.update(chunk)
+            os.replace(snapshot, destination)
+        else:
+            with open(snapshot, "rb") as source, \
+                    open(temporary, "wb") as target:
+                writer = _HashingWriter(target)
+                with compressed_writer(writer, compression) as compressor:
+                    while chunk := source.read(CHUNK_SIZE):
+                        compressor.write(chunk)
+            checksum = writer.hash
+            os.replace(temporary, destination)
+            snapshot.unlink()
+    except BaseException:
+        snapshot.unlink(missing_ok=True)
+        temporary.unlink(missing_ok=True)
+        raise
+    checksum = checksum.hexdigest()
+    destination.with_name(destination.name + ".sha256").write_text(
+        f"{checksum}  {destination.name}\n")
+    return Backup(destination, destination.stat().st_size, database_size,
+                  time.monotonic() - started, checksum)
+
+def backup_database(source: pathlib.Path, destination: pathlib.Path,
+                    step=1024, vacuum=False, verify=False):
+    """Back up a database from the command line."""
+    last = 0
 
-def backup_database(source: pathlib.Path, destination: pathlib.Path):
-    def progress(status, remaining, total):
-        print(f"Copied {total-remaining} of {total} pages...", end="\r")
+    def progress(copied, total):
+        nonlocal last
+        now = time.monotonic()
+        if now - last >= 0.5 or copied == total:  # limit terminal writes
+            last = now
+            print(f"Copied {copied} of {total} pages...", end="\r")
 
     con = sqlite3.connect(ensure_database(source))
-    bck = sqlite3.connect(destination)
     logger.info(f"Backing up to {destination}...")
-    with bck:
-        con.backup(bck, pages=1, progress=progress)
-    bck.close()
-    con.close()
-    logger.info(f"Database backed up.")
+    try:
+        backup = write_backup(con, destination, step, vacuum, verify,
+                              progress)
+    finally:
+        con.close()
+    logger.info(f"Database backed up: {backup.database_size/MIB:.1f} MiB "
+                f"in {backup.seconds:.1f} s "
+                f"({backup.database_size/MIB/max(backup.seconds, 1e-6):.1f} "
+                f"MiB/s), {backup.size/MIB:.1f} MiB written, "
+                f"SHA-256 {backup.checksum}.")
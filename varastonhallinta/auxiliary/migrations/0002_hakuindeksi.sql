@@ -0,0 +1,117 @@
+-- Full-text index for the quick search. One row per product, rowid equals
+-- Tuotteet.id. The trigram tokenizer allows case-insensitive substring
+-- matching.
+
+-- Databases may already have an index built before migrations existed.
+DROP TRIGGER IF EXISTS Tuotehaku_tuote_lisäys;
+DROP TRIGGER IF EXISTS Tuotehaku_tuote_muutos;
+DROP TRIGGER IF EXISTS Tuotehaku_tuote_poisto;
+DROP TRIGGER IF EXISTS Tuotehaku_tilaus_muutos;
+DROP TRIGGER IF EXISTS Tuotehaku_sijainti_muutos;
+DROP TRIGGER IF EXISTS Tuotehaku_tila_muutos;
+DROP TRIGGER IF EXISTS Tuotehaku_toimitustapa_muutos;
+DROP TABLE IF EXISTS Tuotehaku;
+DROP VIEW IF EXISTS Tuotehakutiedot;
+
+CREATE VIEW Tuotehakutiedot AS
+SELECT
+  T.id,
+  T.saapumispvm,
+  T.kuvaus,
+  T.hinta,
+  T.koodi,
+  Sijainnit.kuvaus AS sijainti,
+  Tilat.kuvaus AS tila,
+  Toimitustavat.kuvaus AS toimitustapa,
+  Tilaukset.toimituspvm,
+  CAST(Tilaukset.varausnumero AS TEXT) AS varausnumero,
+  T.lisätiedot
+FROM
+  Tuotteet T LEFT JOIN Sijainnit ON T.sijainti_id = Sijainnit.id
+             LEFT JOIN Tilat ON T.tila_id = Tilat.id
+             LEFT JOIN Tilaukset ON T.tilaus_id = Tilaukset.id
+             LEFT JOIN Toimitustavat ON
+                       Tilaukset.toimitustapa_id = Toimitustavat.id;
+
+CREATE VIRTUAL TABLE Tuotehaku USING fts5(
+    saapumispvm,
+    kuvaus,
+    hinta,
+    koodi,
+    sijainti,
+    tila,
+    toimitustapa,
+    toimituspvm,
+    varausnumero,
+    lisätiedot,
+    tokenize = 'trigram');
+
+INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                       tila, toimitustapa, toimituspvm, varausnumero,
+                       lisätiedot)
+SELECT * FROM Tuotehakutiedot;
+
+CREATE TRIGGER Tuotehaku_tuote_lisäys AFTER INSERT ON Tuotteet BEGIN
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER Tuotehaku_tuote_muutos AFTER UPDATE ON Tuotteet BEGIN
+  DELETE FROM Tuotehaku WHERE rowid = OLD.id;
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER Tuotehaku_tuote_poisto AFTER DELETE ON Tuotteet BEGIN
+  DELETE FROM Tuotehaku WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER Tuotehaku_tilaus_muutos
+AFTER UPDATE OF toimitustapa_id, toimituspvm, varausnumero ON Tilaukset BEGIN
+  DELETE FROM Tuotehaku
+  WHERE rowid IN (SELECT id FROM Tuotteet WHERE tilaus_id = NEW.id);
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot
+  WHERE id IN (SELECT id FROM Tuotteet WHERE tilaus_id = NEW.id);
+END;
+
+CREATE TRIGGER Tuotehaku_sijainti_muutos AFTER UPDATE ON Sijainnit BEGIN
+  DELETE FROM Tuotehaku
+  WHERE rowid IN (SELECT id FROM Tuotteet WHERE sijainti_id = NEW.id);
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot
+  WHERE id IN (SELECT id FROM Tuotteet WHERE sijainti_id = NEW.id);
+END;
+
+CREATE TRIGGER Tuotehaku_tila_muutos AFTER UPDATE ON Tilat BEGIN
+  DELETE FROM Tuotehaku
+  WHERE rowid IN (SELECT id FROM Tuotteet WHERE tila_id = NEW.id);
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot
+  WHERE id IN (SELECT id FROM Tuotteet WHERE tila_id = NEW.id);
+END;
+
+CREATE TRIGGER Tuotehaku_toimitustapa_muutos AFTER UPDATE ON Toimitustavat
+BEGIN
+  DELETE FROM Tuotehaku
+  WHERE rowid IN (SELECT T.id FROM Tuotteet T JOIN Tilaukset
+                  ON T.tilaus_id = Tilaukset.id
+                  WHERE Tilaukset.toimitustapa_id = NEW.id);
+  INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, koodi, sijainti,
+                         tila, toimitustapa, toimituspvm, varausnumero,
+                         lisätiedot)
+  SELECT * FROM Tuotehakutiedot
+  WHERE id IN (SELECT T.id FROM Tuotteet T JOIN Tilaukset
+               ON T.tilaus_id = Tilaukset.id
+               WHERE Tilaukset.toimitustapa_id = NEW.id);
+END;
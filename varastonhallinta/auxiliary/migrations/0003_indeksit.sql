@@ -0,0 +1,13 @@
+-- Join keys.
+CREATE INDEX Tuotteet_tilaus_id ON Tuotteet (tilaus_id);
+CREATE INDEX Tuotteet_sijainti_id ON Tuotteet (sijainti_id);
+CREATE INDEX Tuotteet_tila_id ON Tuotteet (tila_id);
+CREATE INDEX Tilaukset_asiakas_id ON Tilaukset (asiakas_id);
+CREATE INDEX Tilaukset_toimitustapa_id ON Tilaukset (toimitustapa_id);
+
+-- Listings show non-archived rows by default. The query planner only uses
+-- these if the query spells out "arkistoitu = 0" rather than binding it.
+CREATE INDEX Tuotteet_avoimet ON Tuotteet (id) WHERE arkistoitu = 0;
+CREATE INDEX Tuotteet_avoimet_saapumispvm
+ON Tuotteet (saapumispvm COLLATE NOCASE, id) WHERE arkistoitu = 0;
+CREATE INDEX Tilaukset_avoimet ON Tilaukset (id) WHERE arkistoitu = 0;
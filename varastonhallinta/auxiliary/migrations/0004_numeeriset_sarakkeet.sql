@@ -0,0 +1,13 @@
+-- Numeric values of hinta and koodi for sorting and range filters. The text
+-- columns keep the values as entered.
+ALTER TABLE Tuotteet ADD COLUMN hinta_luku REAL
+GENERATED ALWAYS AS (CAST(REPLACE(hinta, ',', '.') AS REAL)) VIRTUAL;
+ALTER TABLE Tuotteet ADD COLUMN koodi_luku INTEGER
+GENERATED ALWAYS AS (CAST(koodi AS INTEGER)) VIRTUAL;
+
+CREATE INDEX Tuotteet_hinta_luku ON Tuotteet (hinta_luku);
+CREATE INDEX Tuotteet_koodi_luku ON Tuotteet (koodi_luku);
+CREATE INDEX Tuotteet_avoimet_hinta_luku
+ON Tuotteet (hinta_luku, id) WHERE arkistoitu = 0;
+CREATE INDEX Tuotteet_avoimet_koodi_luku
+ON Tuotteet (koodi_luku, id) WHERE arkistoitu = 0;
@@ -0,0 +1,6 @@
+-- Structured change log entries. Older rows only have the statement text in
+-- komento.
+ALTER TABLE Muutosloki ADD COLUMN taulu TEXT;
+ALTER TABLE Muutosloki ADD COLUMN toiminto TEXT;  -- INSERT, UPDATE or DELETE
+ALTER TABLE Muutosloki ADD COLUMN rivi_id INTEGER;
+ALTER TABLE Muutosloki ADD COLUMN parametrit TEXT;  -- JSON
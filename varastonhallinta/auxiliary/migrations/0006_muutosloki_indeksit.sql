@@ -0,0 +1,3 @@
+-- Change log browsing by date and by changed row, and rotation by age.
+CREATE INDEX Muutosloki_aikaleima ON Muutosloki (aikaleima);
+CREATE INDEX Muutosloki_rivi ON Muutosloki (taulu, rivi_id);
@@ -0,0 +1,47 @@
+-- Full-text index for picking an order in the product form. One row per
+-- order, rowid equals Tilaukset.id.
+
+CREATE VIEW Tilaushakutiedot AS
+SELECT
+  Tilaukset.id,
+  CAST(Tilaukset.id AS TEXT) AS numero,
+  Asiakkaat.nimi,
+  Asiakkaat.puhelinnumero,
+  CAST(Tilaukset.varausnumero AS TEXT) AS varausnumero
+FROM
+  Tilaukset LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id;
+
+CREATE VIRTUAL TABLE Tilaushaku USING fts5(
+    numero,
+    nimi,
+    puhelinnumero,
+    varausnumero,
+    tokenize = 'trigram');
+
+INSERT INTO Tilaushaku (rowid, numero, nimi, puhelinnumero, varausnumero)
+SELECT * FROM Tilaushakutiedot;
+
+CREATE TRIGGER Tilaushaku_tilaus_lisäys AFTER INSERT ON Tilaukset BEGIN
+  INSERT INTO Tilaushaku (rowid, numero, nimi, puhelinnumero, varausnumero)
+  SELECT * FROM Tilaushakutiedot WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER Tilaushaku_tilaus_muutos
+AFTER UPDATE OF id, asiakas_id, varausnumero ON Tilaukset BEGIN
+  DELETE FROM Tilaushaku WHERE rowid = OLD.id;
+  INSERT INTO Tilaushaku (rowid, numero, nimi, puhelinnumero, varausnumero)
+  SELECT * FROM Tilaushakutiedot WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER Tilaushaku_tilaus_poisto AFTER DELETE ON Tilaukset BEGIN
+  DELETE FROM Tilaushaku WHERE rowid = OLD.id;
+END;
+
+CREATE TRIGGER Tilaushaku_asiakas_muutos
+AFTER UPDATE OF nimi, puhelinnumero ON Asiakkaat BEGIN
+  DELETE FROM Tilaushaku
+  WHERE rowid IN (SELECT id FROM Tilaukset WHERE asiakas_id = NEW.id);
+  INSERT INTO Tilaushaku (rowid, numero, nimi, puhelinnumero, varausnumero)
+  SELECT * FROM Tilaushakutiedot
+  WHERE id IN (SELECT id FROM Tilaukset WHERE asiakas_id = NEW.id);
+END;
@@ -0,0 +1,5 @@
+"""Database schema migrations.
+
+Each NNNN_name.sql script upgrades the schema from version NNNN - 1 to NNNN
+and is run in its own transaction.
+"""
@@ -0,0 +1,13 @@
+-- Change log kept in a separate database file (see --changelog-database).
+PRAGMA journal_mode = WAL;
+
+CREATE TABLE IF NOT EXISTS Muutosloki (
+    id INTEGER PRIMARY KEY,
+    aikaleima TEXT,  -- local ISO 8601 date and time w/ UTC offset
+    komento TEXT,
+    taulu TEXT,
+    toiminto TEXT,  -- INSERT, UPDATE or DELETE
+    rivi_id INTEGER,
+    parametrit TEXT);  -- JSON
+CREATE INDEX IF NOT EXISTS Muutosloki_aikaleima ON Muutosloki (aikaleima);
+CREATE INDEX IF NOT EXISTS Muutosloki_rivi ON Muutosloki (taulu, rivi_id);
@@ -0,0 +1,33 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Startup timing."""
+
+import time
+
+class StartupTimer:
+    """Measure consecutive startup phases."""
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        """End the current phase with given name."""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def add(self, phases: dict, prefix=""):
+        """Include phases measured elsewhere, e.g. in another process."""
+        self.phases.extend((prefix + name, seconds)
+                           for name, seconds in phases.items())
+
+    def report(self) -> str:
+        width = max((len(name) for name, _ in self.phases), default=0)
+        lines = [f"  {name:<{width}} {seconds*1000:8.1f} ms"
+                 for name, seconds in self.phases]
+        total = time.perf_counter() - self.started
+        lines.append(f"  {'total':<{width}} {total*1000:8.1f} ms")
+        return "Startup timing:\n" + "\n".join(lines)
@@ -0,0 +1,224 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Synthetic database generator.
+
+Usage from the varastonhallinta directory:
+
+    python -m benchmarks.generate --products 100000 /tmp/synteettinen.sqlite3
+"""
+
+import argparse
+import datetime
+import itertools
+import logging
+import pathlib
+import random
+import sqlite3
+import sys
+import time
+from auxiliary import db
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10000
+
+ESINEET = ("sohva", "nojatuoli", "ruokapöytä", "sohvapöytä", "tuoli",
+           "jakkara", "kirjahylly", "vaatekaappi", "lipasto", "sänky",
+           "kerrossänky", "patja", "yöpöytä", "työpöytä", "peili", "matto",
+           "valaisin", "lattiavalaisin", "jääkaappi", "pakastin", "liesi",
+           "astianpesukone", "pyykinpesukone", "mikroaaltouuni", "televisio",
+           "radio", "levysoitin", "polkupyörä", "lastenrattaat", "senkki",
+           "vitriini", "kenkäteline", "naulakko", "taulu", "astiasto",
+           "kattila", "pannu", "verhot", "tyynyt", "peitto")
+MATERIAALIT = ("tammi", "koivu", "mänty", "pyökki", "teak", "metalli",
+               "lasi", "nahka", "kangas", "rottinki", "muovi", "vaneri")
+VÄRIT = ("valkoinen", "musta", "harmaa", "ruskea", "beige", "sininen",
+         "vihreä", "punainen", "keltainen", "vaaleanpunainen", "petrooli")
+KUNNOT = ("uudenveroinen", "hyväkuntoinen", "siisti", "käytetty",
+          "kulunut", "korjattava")
+LISÄTIEDOT = ("naarmu kannessa", "puuttuu yksi jalka", "tahra istuimessa",
+              "mukana ohjekirja", "ei pahvilaatikkoa", "toimitus sovittava",
+              "ostaja noutaa lauantaina", "hinta neuvoteltavissa",
+              "säilytys takahuoneessa", "pesty ja tarkistettu")
+ETUNIMET = ("Aino", "Eino", "Helmi", "Väinö", "Ilmari", "Kerttu", "Liisa",
+            "Matti", "Pekka", "Sanna", "Tuula", "Jari", "Päivi", "Jukka",
+            "Mikko", "Anneli", "Juha", "Marja", "Timo", "Sari", "Ville",
+            "Emilia", "Onni", "Aleksi", "Siiri", "Elina", "Ösa", "Åke")
+SUKUNIMET = ("Korhonen", "Virtanen", "Mäkinen", "Nieminen", "Mäkelä",
+             "Hämäläinen", "Laine", "Heikkinen", "Koskinen", "Järvinen",
+             "Lehtonen", "Lehtinen", "Saarinen", "Salminen", "Heinonen",
+             "Niemi", "Heikkilä", "Kinnunen", "Salonen", "Turunen",
+             "Salo", "Laitinen", "Tuominen", "Rantanen", "Karjalainen")
+KADUT = ("Mannerheimintie", "Hämeenkatu", "Aleksanterinkatu", "Koulukatu",
+         "Kirkkokatu", "Rantatie", "Puistotie", "Myllytie", "Koivukuja",
+         "Asemakatu", "Satamakatu", "Pihlajatie", "Tehtaankatu", "Kuusitie")
+KAUPUNGIT = (("00100", "Helsinki"), ("33100", "Tampere"), ("20100", "Turku"),
+             ("90100", "Oulu"), ("40100", "Jyväskylä"), ("15100", "Lahti"),
+             ("70100", "Kuopio"), ("02100", "Espoo"), ("01300", "Vantaa"))
+
+def date(rnd, start, days) -> str:
+    return (start + datetime.timedelta(days=rnd.randrange(days))).isoformat()
+
+def archived(rnd, index, count, ratio) -> int:
+    """Archive the oldest ratio of rows, with some exceptions both ways."""
+    return int((index < ratio*count) != (rnd.random() < 0.05))
+
+def customers(rnd, count):
+    for _ in range(count):
+        postal_code, city = rnd.choice(KAUPUNGIT)
+        yield (f"{rnd.choice(ETUNIMET)} {rnd.choice(SUKUNIMET)}",
+               f"0{rnd.choice((40, 44, 45, 50))} {rnd.randrange(10**7):07}",
+               (f"{rnd.choice(KADUT)} {rnd.randint(1, 120)}, "
+                f"{postal_code} {city}") if rnd.random() < 0.7 else None,
+               rnd.choice(LISÄTIEDOT) if rnd.random() < 0.1 else None,
+               0)
+
+def orders(rnd, count, customer_count, ratio, start, days):
+    for i in range(count):
+        yield (rnd.randint(1, customer_count),
+               rnd.choice((1, 2, None)),
+               date(rnd, start, days) if rnd.random() < 0.8 else None,
+               rnd.randint(1, 9999) if rnd.random() < 0.5 else None,
+               rnd.choice(LISÄTIEDOT) if rnd.random() < 0.15 else None,
+               archived(rnd, i, count, ratio))
+
+def products(rnd, count, order_count, ratio, start, days):
+    for i in range(count):
+        words = [rnd.choice(ESINEET)]
+        if rnd.random() < 0.6:
+            words.append(rnd.choice(MATERIAALIT))
+        if rnd.random() < 0.5:
+            words.append(rnd.choice(VÄRIT))
+        if rnd.random() < 0.3:
+            words.append(rnd.choice(KUNNOT))
+        price = None
+        if rnd.random() < 0.85:
+            price = str(rnd.choice((5, 10, 15, 20, 30, 50, 80, 120, 250))
+                        + rnd.randint(0, 20))
+            if rnd.random() < 0.2:
+                price += f",{rnd.choice((50, 90, 95))}"
+        tilaus_id = None
+        tila_id = 1  # Odottaa
+        if rnd.random() < 0.4:
+            tilaus_id = rnd.randint(1, order_count)
+            tila_id = rnd.choice((2, 3, 3))  # Varattu, Myyty
+        yield (date(rnd, start, days),
+               " ".join(words).capitalize(),
+               price,
+               str(rnd.randint(1, 99999)) if rnd.random() < 0.7 else None,
+               rnd.choice((1, 1, 1, 2, None)),
+               tila_id,
+               rnd.choice(LISÄTIEDOT) if rnd.random() < 0.2 else None,
+               tilaus_id,
+               archived(rnd, i, count, ratio))
+
+def insert(conn, sql, rows, total, name):
+    started = time.perf_counter()
+    done = 0
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            break
+        conn.executemany(sql, batch)
+        done += len(batch)
+        if done % (BATCH_SIZE*50) == 0:
+            logger.info(f"{name}: {done}/{total}")
+    logger.info(f"{name}: {total} rows in "
+                f"{time.perf_counter() - started:.1f} s.")
+
+def generate(path, product_count, order_count=None, customer_count=None,
+             product_ratio=0.6, order_ratio=0.7, seed=0, years=8):
+    """Create a database filled with synthetic data.
+
+    Search index triggers are suspended during the inserts and the indexes
+    are built in one go afterwards, which is many times faster.
+    """
+    path = pathlib.Path(path)
+    if path.exists():
+        raise FileExistsError(path)
+    if order_count is None:
+        order_count = max(1, product_count//4)
+    if customer_count is None:
+        customer_count = max(1, order_count*2//3)
+    rnd = random.Random(seed)
+    days = 365*years
+    start = datetime.date.today() - datetime.timedelta(days=days)
+    db.create_database(path)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("PRAGMA cache_size = -262144")  # 256 MiB
+    triggers = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND "
+        "name IN ('Tuotehaku_tuote_lisäys', 'Tilaushaku_tilaus_lisäys')"
+        ).fetchall()
+    with conn:
+        for name, _ in triggers:
+            conn.execute(f'DROP TRIGGER "{name}"')
+        insert(conn,
+               "INSERT INTO Asiakkaat (nimi, puhelinnumero, osoite, "
+               "lisätiedot, arkistoitu) VALUES (?, ?, ?, ?, ?)",
+               customers(rnd, customer_count), customer_count, "Asiakkaat")
+        insert(conn,
+               "INSERT INTO Tilaukset (asiakas_id, toimitustapa_id, "
+               "toimituspvm, varausnumero, lisätiedot, arkistoitu) "
+               "VALUES (?, ?, ?, ?, ?, ?)",
+               orders(rnd, order_count, customer_count, order_ratio, start,
+                      days),
+               order_count, "Tilaukset")
+        insert(conn,
+               "INSERT INTO Tuotteet (saapumispvm, kuvaus, hinta, koodi, "
+               "sijainti_id, tila_id, lisätiedot, tilaus_id, arkistoitu) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+               products(rnd, product_count, order_count, product_ratio,
+                        start, days),
+               product_count, "Tuotteet")
+        started = time.perf_counter()
+        conn.execute(
+            "INSERT INTO Tuotehaku (rowid, saapumispvm, kuvaus, hinta, "
+            "koodi, sijainti, tila, toimitustapa, toimituspvm, varausnumero, "
+            "lisätiedot) SELECT * FROM Tuotehakutiedot")
+        conn.execute(
+            "INSERT INTO Tilaushaku (rowid, numero, nimi, puhelinnumero, "
+            "varausnumero) SELECT * FROM Tilaushakutiedot")
+        for _, sql in triggers:
+            conn.execute(sql)
+        logger.info(f"Search indexes built in "
+                    f"{time.perf_counter() - started:.1f} s.")
+    conn.execute("ANALYZE")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.close()
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create a database filled with synthetic data.")
+    parser.add_argument("database", metavar="PATHNAME",
+                        help="database file to create")
+    parser.add_argument("--products", metavar="N", type=int, default=10000,
+                        help="products (default: %(default)s)")
+    parser.add_argument("--orders", metavar="N", type=int,
+                        help="orders (default: a quarter of products)")
+    parser.add_argument("--customers", metavar="N", type=int,
+                        help="customers (default: two thirds of orders)")
+    parser.add_argument("--archived-products", metavar="RATIO", type=float,
+                        default=0.6,
+                        help="share of archived products "
+                             "(default: %(default)s)")
+    parser.add_argument("--archived-orders", metavar="RATIO", type=float,
+                        default=0.7,
+                        help="share of archived orders (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed (default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    try:
+        generate(args.database, args.products, args.orders, args.customers,
+                 args.archived_products, args.archived_orders, args.seed)
+    except FileExistsError as e:
+        sys.exit(f"{e} already exists.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Load test against a real server process.
+
+Usage from the varastonhallinta directory (the database is modified):
+
+    python -m benchmarks.load /tmp/synteettinen.sqlite3 --clients 20
+"""
+
+import argparse
+import functools
+import http.client
+import json
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import random
+import re
+import socket
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+from benchmarks.generate import ESINEET, MATERIAALIT, VÄRIT, LISÄTIEDOT
+from benchmarks.queries import git_commit
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = ("list", "search", "create", "edit", "archive")
+DEFAULT_MIX = "list=50,search=25,create=10,edit=10,archive=5"
+READY_TIMEOUT = 30
+RECORD = re.compile(r"^(?=\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)", re.MULTILINE)
+# The writer also logs a failed transaction, but only once for all of its
+# requests, so failures are counted from the errors Flask logs per request.
+REQUEST_ERROR = re.compile(r" ERROR Exception on \S* \[\w+\]")
+BUSY = re.compile(r"OperationalError: database is (locked|busy)")
+QUEUED = re.compile(r"Task queue depth is")  # all threads were busy
+
+def mix(string) -> dict:
+    """Parse request kinds and their weights, e.g. list=3,search=1."""
+    weights = {}
+    for part in string.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown request kind: {kind}")
+        try:
+            weights[kind] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight: {part}")
+    return weights
+
+def log_to_file(path):
+    """Configure logging of the server processes."""
+    logging.basicConfig(filename=path, level=logging.WARNING, force=True,
+                        format="%(asctime)s %(processName)s %(name)s "
+                               "%(levelname)s %(message)s")
+
+class HTTPError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+class Client:
+    """One terminal with its own keep-alive connection."""
+
+    def __init__(self, port, max_id, seed):
+        self.port = port
+        self.max_id = max_id
+        self.rnd = random.Random(seed)
+        self.connection = None
+
+    def request(self, method, path, form=None) -> bytes:
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection("::1", self.port,
+                                                         timeout=60)
+        body = headers = None
+        if form is not None:
+            body = urlencode(form)
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        try:
+            self.connection.request(method, path, body, headers or {})
+            response = self.connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            raise
+        if response.status >= 400:
+            raise HTTPError(response.status)
+        return data
+
+    def description(self) -> str:
+        words = [self.rnd.choice(ESINEET), self.rnd.choice(MATERIAALIT)]
+        if self.rnd.random() < 0.5:
+            words.append(self.rnd.choice(VÄRIT))
+        return " ".join(words).capitalize()
+
+    def list(self):
+        path = self.rnd.choice(("/products_json", "/orders_json"))
+        offset = self.rnd.choice((0, 0, 0, 50, 100, 500))
+        self.request("GET", f"{path}?limit=50&offset={offset}")
+
+    def search(self):
+        term = self.rnd.choice(ESINEET + MATERIAALIT + VÄRIT)
+        self.request("GET", "/products_json?" + urlencode(
+            {"limit": 50, "search": term[:self.rnd.randint(3, len(term))]}))
+
+    def create(self):
+        self.request("POST", "/create", {
+            "saapumispvm": time.strftime("%Y-%m-%d"),
+            "kuvaus": self.description(),
+            "hinta": str(self.rnd.randint(5, 300)),
+            "koodi": str(self.rnd.randint(1, 99999)),
+            "sijainti_id": "1",
+            "tila_id": "1",
+            "lisätiedot": "",
+            "tilaus_id": ""})
+
+    def edit(self):
+        product_id = self.rnd.randint(1, self.max_id)
+        product = json.loads(self.request("GET", f"/{product_id}"))
+        form = {name: "" if product[name] is None else str(product[name])
+                for name in ("saapumispvm", "kuvaus", "hinta", "koodi",
+                             "sijainti_id", "tila_id", "tilaus_id")}
+        form["lisätiedot"] = self.rnd.choice(LISÄTIEDOT)
+        self.request("POST", f"/{product_id}/edit", form)
+
+    def archive(self):
+        # Unarchive as often, so that the share of open products holds.
+        action = self.rnd.choice(("archive", "unarchive"))
+        self.request("POST",
+                     f"/{self.rnd.randint(1, self.max_id)}/{action}", {})
+
+def drive(client, weights, deadline, results, lock):
+    """Send requests of weighted random kinds until the deadline."""
+    kinds, cumulative = list(weights), []
+    total = 0
+    for kind in kinds:
+        total += weights[kind]
+        cumulative.append(total)
+    while time.monotonic() < deadline:
+        kind = client.rnd.choices(kinds, cum_weights=cumulative)[0]
+        started = time.perf_counter()
+        error = None
+        try:
+            getattr(client, kind)()
+        except HTTPError as e:
+            error = str(e.status)
+        except (OSError, http.client.HTTPException) as e:
+            error = type(e).__name__
+        elapsed = time.perf_counter() - started
+        with lock:
+            result = results[kind]
+            result["latencies"].append(elapsed)
+            if error is not None:
+                result["errors"][error] = result["errors"].get(error, 0) + 1
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction*len(values)))]
+
+def summarize(results, seconds) -> dict:
+    summary = {}
+    everything = []
+    for kind, result in results.items():
+        latencies = sorted(result["latencies"])
+        everything.extend(latencies)
+        summary[kind] = {"requests": len(latencies),
+                         "errors": result["errors"]}
+        if latencies:
+            summary[kind].update(
+                {f"p{p}": percentile(latencies, p/100)*1000
+                 for p in (50, 95, 99)})
+    everything.sort()
+    errors = sum(sum(r["errors"].values()) for r in results.values())
+    summary["total"] = {"requests": len(everything),
+                        "errors": errors,
+                        "error_rate": errors/len(everything) if everything
+                                      else 0,
+                        "throughput": len(everything)/seconds}
+    if everything:
+        summary["total"].update(
+            {f"p{p}": percentile(everything, p/100)*1000
+             for p in (50, 95, 99)})
+    return summary
+
+def start_server(database, log, threads, workers, connection_limit):
+    """Start a server on a free port and return the process and port."""
+    from wsgi.server import prefork_server, wsgi_server
+    sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+    sock.bind(("::1", 0, 0, 0))
+    ready, ready_sender = multiprocessing.Pipe(duplex=False)
+    kwargs = dict(threads=threads, connection_limit=connection_limit,
+                  ready=ready_sender)
+    if workers > 1:
+        kwargs["workers"] = workers
+    server = multiprocessing.Process(
+        target=prefork_server if workers > 1 else wsgi_server,
+        args=([sock], database, False, False,
+              functools.partial(log_to_file, log)),
+        kwargs=kwargs)
+    server.start()
+    ready_sender.close()
+    port = sock.getsockname()[1]
+    sock.close()  # the server processes have their own
+    multiprocessing.connection.wait([ready, server.sentinel],
+                                    timeout=READY_TIMEOUT)
+    if not ready.poll():
+        server.terminate()
+        raise ConnectionError("Server didn't start, see " + log)
+    ready.recv()
+    return server, port
+
+def run(database, clients=20, duration=30, weights=None, threads=6,
+        workers=1, connection_limit=100, seed=0) -> dict:
+    """Drive a server from concurrent clients and return a summary."""
+    weights = weights or mix(DEFAULT_MIX)
+    conn = sqlite3.connect(database)
+    try:
+        max_id, = conn.execute("SELECT MAX(id) FROM Tuotteet").fetchone()
+    finally:
+        conn.close()
+    if not max_id:
+        raise ValueError("The database has no products.")
+    log = tempfile.NamedTemporaryFile(prefix="kuormitus-", suffix=".log",
+                                      delete=False).name
+    server, port = start_server(database, log, threads, workers,
+                                connection_limit)
+    logger.info(f"Server listening on port {port}, logging to {log}.")
+    results = {kind: {"latencies": [], "errors": {}} for kind in weights}
+    lock = threading.Lock()
+    try:
+        started = time.monotonic()
+        deadline = started + duration
+        drivers = [threading.Thread(
+                       target=drive, name=f"Client-{i}",
+                       args=(Client(port, max_id, seed + i), weights,
+                             deadline, results, lock))
+                   for i in range(clients)]
+        for driver in drivers:
+            driver.start()
+        for driver in drivers:
+            driver.join()
+        seconds = time.monotonic() - started
+    finally:
+        server.terminate()
+        server.join()
+    with open(log, encoding="utf-8", errors="replace") as file:
+        text = file.read()
+    summary = summarize(results, seconds)
+    summary["total"]["sqlite_busy"] = sum(
+        1 for record in RECORD.split(text)
+        if REQUEST_ERROR.search(record) and BUSY.search(record))
+    summary["total"]["queued"] = len(QUEUED.findall(text))
+    return {"started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "commit": git_commit(),
+            "database": str(database),
+            "clients": clients,
+            "duration": seconds,
+            "threads": threads,
+            "workers": workers,
+            "mix": weights,
+            "server_log": log,
+            "results": summary}
+
+def report(summary):
+    total = summary["results"]["total"]
+    logger.info(f"{total['requests']} requests in "
+                f"{summary['duration']:.1f} s, "
+                f"{total['throughput']:.1f} requests/s, "
+                f"{total['error_rate']:.2%} errors, "
+                f"{total['sqlite_busy']} failed with SQLITE_BUSY, "
+                f"{total['queued']} times all server threads busy")
+    logger.info(f"{'':<8} {'requests':>9} {'errors':>7} {'p50':>9} "
+                f"{'p95':>9} {'p99':>9}")
+    for kind, result in summary["results"].items():
+        errors = result["errors"]
+        if isinstance(errors, dict):
+            errors = sum(errors.values())
+        logger.info(f"{kind:<8} {result['requests']:>9} {errors:>7} "
+                    + " ".join(f"{result.get(p, 0):>6.1f} ms"
+                               for p in ("p50", "p95", "p99")))
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Drive a server process from concurrent clients. "
+                    "Requests modify the database, so use a copy or a "
+                    "generated one.")
+    parser.add_argument("database", metavar="PATHNAME",
+                        help="database file, e.g. from benchmarks.generate")
+    parser.add_argument("-o", "--output", metavar="PATHNAME",
+                        help="write results as JSON to PATHNAME")
+    parser.add_argument("--clients", metavar="N", type=int, default=20,
+                        help="concurrent clients (default: %(default)s)")
+    parser.add_argument("--duration", metavar="SECONDS", type=float,
+                        default=30,
+                        help="length of the test (default: %(default)s)")
+    parser.add_argument("--mix", metavar="KIND=WEIGHT,...", type=mix,
+                        default=DEFAULT_MIX,
+                        help=f"request kinds and their weights; kinds are "
+                             f"{', '.join(OPERATIONS)} "
+                             f"(default: {DEFAULT_MIX})")
+    parser.add_argument("--threads", metavar="N", type=int, default=6,
+                        help="server threads per process "
+                             "(default: %(default)s)")
+    parser.add_argument("--workers", metavar="N", type=int, default=1,
+                        help="server processes (default: %(default)s)")
+    parser.add_argument("--connection-limit", metavar="N", type=int,
+                        default=100,
+                        help="server connection limit "
+                             "(default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="random seed (default: %(default)s)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not os.path.exists(args.database):
+        sys.exit(f"{args.database} doesn't exist.")
+    summary = run(args.database, args.clients, args.duration, args.mix,
+                  args.threads, args.workers, args.connection_limit,
+                  args.seed)
+    report(summary)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Listing query benchmarks through the Flask test client.
+
+Usage from the varastonhallinta directory:
+
+    python -m benchmarks.queries /tmp/synteettinen.sqlite3 -o tulos.json
+"""
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlencode
+from auxiliary.conf import VERSION
+
+logger = logging.getLogger(__name__)
+
+LIMIT = 50
+
+# Advanced search with every filter open.
+ADVANCED = {"search": "(tarkennettu haku)", "numero": ",",
+            "saapumispvm": ",", "toimituspvm": ",", "varausnumero": ",",
+            "hinta": ",", "sijainti": "Varasto,Välivarasto,-",
+            "tila": "Odottaa,Varattu,Myyty",
+            "toimitustapa": "Nouto,Toimitus,-", "arkistoitu": "0,1"}
+
+def url(path, **params) -> str:
+    return f"{path}?{urlencode(dict(params, limit=LIMIT))}"
+
+def cases(client, conn) -> dict:
+    """Return benchmark names and the URLs they request."""
+    open_products, = conn.execute(
+        "SELECT COUNT(*) FROM Tuotteet WHERE arkistoitu = 0").fetchone()
+    open_orders, = conn.execute(
+        "SELECT COUNT(*) FROM Tilaukset WHERE arkistoitu = 0").fetchone()
+    deep_products = max(0, open_products - 2*LIMIT)
+    deep_orders = max(0, open_orders - 2*LIMIT)
+    first_page = client.get(url("/products_json")).get_json()
+    return {
+        "products_first_page": url("/products_json"),
+        "products_next_page_cursor": url(
+            "/products_json", offset=LIMIT,
+            cursor=first_page.get("cursor") or ""),
+        "products_quick_search": url("/products_json", search="tammi"),
+        "products_quick_search_rare": url("/products_json",
+                                          search="petrooli"),
+        "products_quick_search_short": url("/products_json", search="ta"),
+        "products_regex_search": url(
+            "/products_json", **dict(ADVANCED,
+                                     regex_search=r"tuoli.*(musta|harmaa)",
+                                     ignore_case="true")),
+        "products_multiselect": url(
+            "/products_json", **dict(ADVANCED, sijainti="Varasto",
+                                     tila="Odottaa,Varattu",
+                                     toimitustapa="Nouto,-",
+                                     arkistoitu="0")),
+        "products_advanced_all": url("/products_json", **ADVANCED),
+        "products_sort_hinta": url("/products_json", sort="hinta",
+                                   order="asc"),
+        "products_sort_koodi": url("/products_json", sort="koodi",
+                                   order="desc"),
+        "products_deep_page": url("/products_json", offset=deep_products),
+        "products_deep_page_hinta": url("/products_json", sort="hinta",
+                                        order="asc", offset=deep_products),
+        "orders_first_page": url("/orders_json"),
+        "orders_sort_asiakas": url("/orders_json", sort="asiakas",
+                                   order="asc"),
+        "orders_sort_tuotteet": url("/orders_json", sort="tuotteet",
+                                    order="asc"),
+        "orders_deep_page": url("/orders_json", offset=deep_orders),
+    }
+
+def summarize(durations) -> dict:
+    durations = sorted(durations)
+    return {"min": durations[0],
+            "median": statistics.median(durations),
+            "mean": statistics.fmean(durations),
+            "p95": durations[min(len(durations) - 1,
+                                 int(0.95*len(durations)))],
+            "max": durations[-1]}
+
+def measure(client, path, repeat, warmup) -> dict:
+    """Request a URL repeatedly and summarize the durations in ms.
+
+    Application caches are cleared before each timed request, so that row
+    counts and reference data are queried every time. Each is followed by
+    a request served from the caches, which is summarized under warm.
+    """
+    from wsgi.application import cache
+    for _ in range(warmup):
+        client.get(path)
+    cold, warm = [], []
+    for _ in range(repeat):
+        cache.bump()
+        started = time.perf_counter()
+        response = client.get(path)
+        cold.append((time.perf_counter() - started)*1000)
+        started = time.perf_counter()
+        client.get(path)
+        warm.append((time.perf_counter() - started)*1000)
+    body = response.get_json(silent=True) or {}
+    return {"url": path,
+            "status": response.status_code,
+            "rows": len(body.get("rows", ())),
+            "total": body.get("total"),
+            "bytes": len(response.data),
+            **summarize(cold),
+            "warm": summarize(warm)}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def describe(database) -> dict:
+    conn = sqlite3.connect(database)
+    try:
+        counts = {table: conn.execute(
+                      f"SELECT COUNT(*), IFNULL(SUM(arkistoitu), 0) "
+                      f"FROM {table}").fetchone()
+                  for table in ("Tuotteet", "Tilaukset", "Asiakkaat")}
+    finally:
+        conn.close()
+    return {"path": str(database),
+            "size": os.path.getsize(database),
+            "rows": {table: {"total": total, "archived": archived}
+                     for table, (total, archived) in counts.items()}}
+
+def run(database, repeat=20, warmup=2, only=None) -> dict:
+    """Run the benchmarks against a database and return the results."""
+    from wsgi.application.flask_app import app
+    import wsgi.application  # registers the views
+    app.config["database"] = str(database)
+    client = app.test_client()
+    conn = sqlite3.connect(database)
+    try:
+        benchmarks = cases(client, conn)
+    finally:
+        conn.close()
+    results = {}
+    for name, path in benchmarks.items():
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = measure(client, path, repeat, warmup)
+        logger.info(f"{name:<30} {results[name]['median']:9.2f} ms, "
+                    f"warm {results[name]['warm']['median']:9.2f} ms")
+    return {"started": datetime.datetime.now().astimezone().isoformat(),
+            "version": VERSION,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "database": describe(database),
+            "repeat": repeat,
+            "warmup": warmup,
+            "results": results}
+
+def compare(baseline, current):
+    """Log median changes relative to an earlier run."""
+    for name, result in current["results"].items():
+        earlier = baseline["results"].get(name)
+        if earlier is None:
+            continue
+        change = result["median"]/earlier["median"] - 1
+        logger.info(f"{name:<30} {earlier['median']:9.2f} -> "
+                    f"{result['median']:9.2f} ms ({change:+.0%})")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time listing requests against a database.")
+    parser.add_argument("database", metavar="PATHNAME",
+                        help="database file, e.g. from benchmarks.generate")
+    parser.add_argument("-o", "--output", metavar="PATHNAME",
+                        help="write results as JSON to PATHNAME")
+    parser.add_argument("--compare", metavar="PATHNAME",
+                        help="compare medians with earlier JSON results")
+    parser.add_argument("--repeat", metavar="N", type=int, default=20,
+                        help="timed requests per benchmark "
+                             "(default: %(default)s)")
+    parser.add_argument("--warmup", metavar="N", type=int, default=2,
+                        help="untimed requests before timing "
+                             "(default: %(default)s)")
+    parser.add_argument("--only", metavar="TEXT", action="append",
+                        help="run benchmarks whose name contains TEXT "
+                             "(repeatable)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if not os.path.exists(args.database):
+        sys.exit(f"{args.database} doesn't exist.")
+    results = run(args.database, args.repeat, args.warmup, args.only)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(json.load(file), results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, ensure_ascii=False, indent=2)
+
+if __name__ == "__main__":
+    main()
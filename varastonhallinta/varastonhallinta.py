@@ -9,41 +9,67 @@
 import ipaddress
 import logging
 import multiprocessing
+import multiprocessing.connection
 import os
 import socket
 import sys
-import time
 from contextlib import suppress
 from functools import partial
-import urllib3
 from auxiliary import conf, db
-from clients.webruntime import launch_runtime
-from wsgi.server import wsgi_server
+from auxiliary.timing import StartupTimer
+
+READY_TIMEOUT = 10  # seconds
+
+def wait_until_ready(server, ready) -> dict:
+    """Wait for the server process to signal that it accepts requests.
+
+    Returns the durations of the server's own startup phases.
+    """
+    multiprocessing.connection.wait([ready, server.sentinel], READY_TIMEOUT)
+    with suppress(EOFError):  # the server exited without a message
+        if ready.poll():
+            return ready.recv()
+    # The pipe may be closed a moment before the process is gone.
+    server.join(1)
+    logger = logging.getLogger(__name__)
+    if server.is_alive():
+        logger.critical(f"No response in {READY_TIMEOUT} seconds.")
+    else:
+        logger.critical(f"Server exited with code {server.exitcode}.")
+    raise ConnectionError("Server failed to respond.")
 
 def main():
     """Run the program."""
+    timer = StartupTimer()
 
     # Command-line arguments.
     args = conf.parse_command_line_args()
 
-    # Logging.
-    queue = multiprocessing.Queue(-1)
-    logging_listener = multiprocessing.Process(target=conf.listener_process,
-                                               args=(queue,))
-    logging_listener.start()
-    configurer = partial(conf.worker_logger_configurer, queue, args.loglevel)
+    # Logging. A listener process serializes the output of processes that
+    # log concurrently; a single one writes the output itself.
+    if (args.version or args.backup
+            or (args.server_only and args.workers <= 1)):
+        queue = logging_listener = None
+        configurer = partial(conf.output_logger_configurer, args.loglevel)
+    else:
+        queue = multiprocessing.Queue(1000)  # batches of records
+        logging_listener = multiprocessing.Process(
+            target=conf.listener_process, args=(queue,))
+        logging_listener.start()
+        configurer = partial(conf.worker_logger_configurer, queue,
+                             args.loglevel)
     configurer()
     if os.name == "posix":
         configurer = None  # root logger propagates its handler
     logger = logging.getLogger(__name__)
+    timer.mark("arguments and logging")
 
     if args.version:
         print(conf.VERSION)
-        queue.put_nowait(None)
         sys.exit()
     elif args.backup:
-        db.backup_database(args.database, args.backup)
-        queue.put_nowait(None)
+        db.backup_database(args.database, args.backup, args.backup_step,
+                           args.backup_vacuum, args.backup_verify)
         sys.exit()
 
     # Legal notice.
@@ -55,15 +81,49 @@ def main():
     with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as sock:
         if not args.client_only:
             database = db.ensure_database(args.database)
+            changelog_database = None
+            if args.changelog_database is not None:
+                changelog_database = db.ensure_changelog_database(
+                    args.changelog_database)
+            timer.mark("database")
+            from wsgi.server import prefork_server, wsgi_server
+            timer.mark("server imports")
             sock.bind((args.host, args.port, args.flowinfo, args.scope_id))
             logger.debug(f"Socket: {sock}")
-            server = multiprocessing.Process(target=wsgi_server,
-                                             args=([sock],
-                                                   database,
-                                                   args.translogger,
-                                                   args.dev,
-                                                   configurer))
+            ready, ready_sender = multiprocessing.Pipe(duplex=False)
+            server_kwargs = dict(pragmas=args.pragmas,
+                                 cached_statements=args.statement_cache,
+                                 changelog_database=changelog_database,
+                                 changelog_retention=args.changelog_retention,
+                                 changelog_archive=args.changelog_archive,
+                                 slow_query=args.slow_query,
+                                 threads=args.threads,
+                                 connection_limit=args.connection_limit,
+                                 backlog=args.backlog,
+                                 channel_timeout=args.channel_timeout,
+                                 backup_interval=args.backup_interval,
+                                 backup_directory=args.backup_directory,
+                                 backup_keep=args.backup_keep,
+                                 backup_step=args.backup_step,
+                                 backup_vacuum=args.backup_vacuum,
+                                 backup_verify=args.backup_verify,
+                                 profile=args.profile,
+                                 profile_every=args.profile_every,
+                                 profile_route=args.profile_route,
+                                 ready=ready_sender)
+            if args.workers > 1:
+                server_kwargs["workers"] = args.workers
+            server = multiprocessing.Process(
+                target=prefork_server if args.workers > 1 else wsgi_server,
+                args=([sock],
+                      database,
+                      args.translogger,
+                      args.dev,
+                      configurer),
+                kwargs=server_kwargs)
         if not args.server_only:
+            from clients.webruntime import launch_runtime
+            timer.mark("client imports")
             scheme, host, port = args.scheme, args.host, args.port
             if not args.client_only:
                 port = sock.getsockname()[1]
@@ -79,35 +139,29 @@ def main():
                                                    args.window_size,
                                                    args.window_pos,
                                                    configurer))
-        if args.server_only:
-            server.start()
-        elif args.client_only:
-            client.start()
-        else:
+        if not args.client_only:
             logger.debug("Starting server...")
             server.start()
-            logger.debug("Waiting for server to respond...")
-            http = urllib3.PoolManager(timeout=10.0, retries=1)
-            time.sleep(0.1)
-            try:
-                for _ in range(10):
-                    time.sleep(1)
-                    with suppress(urllib3.exceptions.HTTPError):
-                        if http.request("HEAD", url).status == 200:
-                            break
-                else:
-                    logger.critical("Maximum retries exceeded.")
-                    raise ConnectionError
-            except ConnectionError:
-                raise ConnectionError("Server failed to respond.")
-            else:
+            ready_sender.close()  # the server processes have their own
+        try:
+            if not args.client_only:
+                logger.debug("Waiting for server to be ready...")
+                server_phases = wait_until_ready(server, ready)
+                timer.mark("server ready")
+                timer.add(server_phases, prefix="  server: ")
+            if not args.server_only:
                 logger.debug("Starting client...")
                 client.start()
+                timer.mark("client started")
+            if args.startup_timing:
+                logger.info(timer.report())
+            if not (args.server_only or args.client_only):
                 client.join()  # wait until the client terminates
-            finally:
+        finally:
+            if not (args.server_only or args.client_only):
                 server.terminate()
-                queue.put_nowait(None)  # command logging listener to quit
-                logging_listener.join()
+                server.join()  # the server sends its remaining logs on exit
+                conf.stop_listener(queue, logging_listener)
 
 if __name__ == "__main__":
     multiprocessing.freeze_support()  # required for pyinstaller on windows
@@ -1,4 +1,4 @@
 """Bring modules together to avoid circular imports."""
 
-from . import flask_app
-from .views import products, orders
+from . import flask_app, assets
+from .views import products, orders, changes, monitoring
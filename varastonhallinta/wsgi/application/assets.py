@@ -0,0 +1,152 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Fingerprinted and precompressed static files."""
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import pathlib
+import posixpath
+import re
+import threading
+from flask import Response, request
+from wsgi.application.flask_app import app
+from wsgi.application.responses import COMPRESSIBLE_TYPES, brotli
+
+logger = logging.getLogger(__name__)
+
+MAX_AGE = 365*24*60*60
+
+# Relative references in stylesheets, e.g. url(../webfonts/x.woff2?#iefix).
+CSS_URL = re.compile(rb"""url\((['"]?)([^'"():]+?)([?#][^'"()]*)?\1\)""")
+
+_lock = threading.Lock()
+_assets = None  # original name => Asset
+_fingerprinted = None  # fingerprinted name => Asset
+
+class Asset:
+    """Content of a static file and its compressed variants.
+
+    The fingerprinted name has a hash of the content before the suffix,
+    so the file can be cached for good.
+    """
+
+    def __init__(self, name, data):
+        self.data = data
+        digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+        stem, suffix = posixpath.splitext(name)
+        self.name = f"{stem}.{digest}{suffix}"
+        self.mimetype = (mimetypes.guess_type(name)[0]
+                         or "application/octet-stream")
+        self.compressible = (self.mimetype.startswith("text/")
+                             or self.mimetype in COMPRESSIBLE_TYPES)
+        self._variants = {}
+        self._lock = threading.Lock()
+
+    def variant(self, encoding):
+        """Return content in given coding, or None if it isn't smaller.
+
+        Variants are compressed at the highest level on first use.
+        """
+        if encoding is None:
+            return self.data
+        if not self.compressible:
+            return None
+        with self._lock:
+            if encoding not in self._variants:
+                if encoding == "br":
+                    data = brotli.compress(self.data, quality=11)
+                else:
+                    data = gzip.compress(self.data, compresslevel=9, mtime=0)
+                self._variants[encoding] = (data if len(data) < len(self.data)
+                                            else None)
+            return self._variants[encoding]
+
+def encodings() -> tuple:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+def rewrite_references(data: bytes, name: str, assets: dict) -> bytes:
+    """Point relative url() references to fingerprinted names."""
+    directory = posixpath.dirname(name)
+
+    def replace(match):
+        reference = match[2].decode()
+        target = posixpath.normpath(posixpath.join(directory, reference))
+        asset = assets.get(target)
+        if asset is None:
+            return match[0]
+        reference = posixpath.join(posixpath.dirname(reference),
+                                   posixpath.basename(asset.name))
+        return b"url(%s%s%s%s)" % (match[1], reference.encode(),
+                                   match[3] or b"", match[1])
+    return CSS_URL.sub(replace, data)
+
+def build(folder) -> dict:
+    """Read and fingerprint the files of a static folder.
+
+    Stylesheets go last, so that their references to other files can be
+    rewritten first.
+    """
+    folder = pathlib.Path(folder)
+    paths = sorted((p for p in folder.rglob("*") if p.is_file()),
+                   key=lambda p: (p.suffix == ".css", p))
+    assets = {}
+    for path in paths:
+        name = path.relative_to(folder).as_posix()
+        data = path.read_bytes()
+        if path.suffix == ".css":
+            data = rewrite_references(data, name, assets)
+        assets[name] = Asset(name, data)
+    return assets
+
+def manifest() -> dict:
+    """Return static files by original name, building them on first use."""
+    global _assets, _fingerprinted
+    with _lock:
+        if _assets is None:
+            _assets = build(app.static_folder)
+            _fingerprinted = {a.name: a for a in _assets.values()}
+            logger.debug(f"Fingerprinted {len(_assets)} static files.")
+        return _assets
+
+def precompress():
+    """Compress all variants ahead of the first requests."""
+    for asset in manifest().values():
+        for encoding in encodings():
+            asset.variant(encoding)
+    logger.debug("Precompressed static files.")
+
+@app.url_defaults
+def fingerprint(endpoint, values):
+    """Make url_for("static", ...) return fingerprinted names."""
+    if endpoint == "static" and not app.debug:
+        asset = manifest().get(values.get("filename"))
+        if asset is not None:
+            values["filename"] = asset.name
+
+def static(filename):
+    """Serve a fingerprinted static file as immutable."""
+    manifest()
+    asset = _fingerprinted.get(filename)
+    if asset is None:
+        return app.send_static_file(filename)
+    for encoding in encodings():
+        if request.accept_encodings[encoding]:
+            data = asset.variant(encoding)
+            if data is not None:
+                break
+    else:
+        encoding, data = None, asset.data
+    response = Response(data, mimetype=asset.mimetype)
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+    if asset.compressible:
+        response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = (f"public, max-age={MAX_AGE}, "
+                                         f"immutable")
+    return response
+
+app.view_functions["static"] = static
@@ -0,0 +1,96 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Scheduled online backups."""
+
+import logging
+import pathlib
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from auxiliary import db
+
+logger = logging.getLogger(__name__)
+
+PAUSE = 0.05  # seconds between copy steps
+
+_last = None  # db.Backup of the latest scheduled backup
+
+def last_backup():
+    """Return the latest scheduled backup, or None."""
+    return _last
+
+class Scheduler(threading.Thread):
+    """Periodically back up a database and delete old backups.
+
+    Backups are copied step pages at a time with pauses in between, so
+    that requests keep their share of the disk and the interpreter.
+    """
+
+    def __init__(self, database, directory, interval, keep=7, step=1024,
+                 vacuum=False, verify=False):
+        super().__init__(name="Backup scheduler", daemon=True)
+        self.database = pathlib.Path(database)
+        self.directory = pathlib.Path(directory)
+        self.interval = interval
+        self.keep = keep
+        self.step = step
+        self.vacuum = vacuum
+        self.verify = verify
+        self.suffix = (".sqlite3.zst" if db.zstandard is not None
+                       else ".sqlite3.gz")
+        self.stopped = threading.Event()
+
+    def backups(self) -> list:
+        """Return existing backups, oldest first."""
+        pattern = re.compile(re.escape(self.database.stem)
+                             + r"-\d{8}-\d{6}\.sqlite3\.(gz|zst)")
+        return sorted(path for path in self.directory.glob(
+                          f"{self.database.stem}-*")
+                      if pattern.fullmatch(path.name))
+
+    def back_up(self) -> db.Backup:
+        global _last
+        self.directory.mkdir(parents=True, exist_ok=True)
+        destination = self.directory / (
+            f"{self.database.stem}-{datetime.now():%Y%m%d-%H%M%S}"
+            f"{self.suffix}")
+        connection = sqlite3.connect(self.database)
+        try:
+            backup = db.write_backup(connection, destination, self.step,
+                                     self.vacuum, self.verify,
+                                     pause=PAUSE)
+        finally:
+            connection.close()
+        _last = backup
+        logger.info(f"Backed up database to {destination} in "
+                    f"{backup.seconds:.1f} s "
+                    f"({backup.database_size/db.MIB:.1f} MiB, "
+                    f"{backup.size/db.MIB:.1f} MiB written).")
+        return backup
+
+    def prune(self):
+        """Delete backups beyond the number to keep."""
+        backups = self.backups()
+        for path in backups[:max(0, len(backups) - self.keep)]:
+            path.unlink()
+            path.with_name(path.name + ".sha256").unlink(missing_ok=True)
+            logger.info(f"Deleted old backup {path}.")
+
+    def run(self):
+        # Continue the schedule of earlier runs instead of backing up on
+        # every start.
+        backups = self.backups()
+        if backups:
+            age = time.time() - backups[-1].stat().st_mtime
+            self.stopped.wait(max(0, self.interval - age))
+        while not self.stopped.is_set():
+            try:
+                self.back_up()
+                self.prune()
+            except Exception:
+                logger.exception("Scheduled backup failed.")
+            self.stopped.wait(self.interval)
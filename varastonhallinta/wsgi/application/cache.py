@@ -0,0 +1,135 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Caches invalidated by database writes."""
+
+import logging
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_generation = 0  # of the latest write
+_epoch = 0  # generation of the latest write to unknown tables
+_tables = {}  # table name => generation of the latest write to it
+_commits = 0  # writes to known tables through this process
+_log_id = None  # latest change log entry accounted for
+_instance = secrets.token_hex(8)  # tells this process from others
+
+def bump(tables=None):
+    """Invalidate values depending on given tables, or all by default."""
+    global _generation, _epoch, _commits
+    with _lock:
+        _generation += 1
+        if tables is None:
+            _epoch = _generation
+        else:
+            _commits += 1
+            for table in tables:
+                _tables[table.lower()] = _generation
+
+def latest_log_id(conn: sqlite3.Connection) -> int:
+    """Return the id of the newest change log entry."""
+    schema = getattr(getattr(conn, "changelog", None), "schema", "main")
+    return conn.execute(
+        f"SELECT IFNULL(MAX(id), 0) FROM {schema}.Muutosloki").fetchone()[0]
+
+def logged_tables(conn: sqlite3.Connection, after: int) -> set:
+    """Return tables named by change log entries newer than given id."""
+    schema = getattr(getattr(conn, "changelog", None), "schema", "main")
+    return {row[0] for row in conn.execute(
+        f"SELECT DISTINCT taulu FROM {schema}.Muutosloki WHERE id > ?",
+        (after,))}
+
+def generation(conn: sqlite3.Connection, tables=None) -> int:
+    """Return the current write generation, optionally for given tables.
+
+    Commits through this process bump the generation directly. Commits by
+    other processes of the application are noticed through new change log
+    entries, which name the tables they modified. Entries of this process
+    are read the same way, as their ids interleave with those of other
+    processes, so that none are skipped. Other changes are
+    noticed through PRAGMA data_version, which only changes between calls
+    on the same connection, and invalidate everything. A data_version
+    change that coincides with commits through this process is attributed
+    to them.
+    """
+    global _log_id
+    version = conn.execute("PRAGMA data_version").fetchone()[0]
+    log_id = latest_log_id(conn)
+    seen = getattr(conn, "data_version", None)
+    commits = getattr(conn, "commits_seen", None)
+    conn.data_version = version
+    conn.commits_seen = _commits
+    if _log_id is None:
+        with _lock:
+            if _log_id is None:
+                _log_id = log_id  # nothing cached yet
+    elif log_id > _log_id:
+        logged = logged_tables(conn, _log_id)
+        bump(None if None in logged else logged)
+        with _lock:
+            _log_id = max(_log_id, log_id)
+    elif seen is not None and seen != version and commits == _commits:
+        bump()
+    if tables is None:
+        return _generation
+    return max([_epoch] + [_tables.get(table.lower(), 0) for table in tables])
+
+def state(conn: sqlite3.Connection) -> str:
+    """Return a token that changes whenever the database contents do.
+
+    Unlike the generation, the token is the same in every process, as it
+    consists of the ids of the oldest and newest change log entries. Only
+    changes that weren't logged, e.g. by other programs, make it specific
+    to this process.
+    """
+    generation(conn)
+    schema = getattr(getattr(conn, "changelog", None), "schema", "main")
+    first, last = conn.execute(
+        f"SELECT MIN(id), MAX(id) FROM {schema}.Muutosloki").fetchone()
+    if _epoch:
+        return f"{first}:{last}:{_instance}:{_epoch}"
+    return f"{first}:{last}"
+
+class Cache:
+    """Map keys to values computed within the same write generation.
+
+    A cache that only depends on some tables can name them, so that writes
+    to other tables don't invalidate it.
+    """
+
+    def __init__(self, name, maxsize=256, tables=None):
+        self.name = name
+        self.maxsize = maxsize
+        self.tables = tables
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conn, key, compute):
+        """Return cached value for key, or compute and cache it."""
+        current = generation(conn, self.tables)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == current:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = (current, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        logger.debug(f"{self.name} cache: {self.stats()}")
+        return value
+
+    def stats(self) -> str:
+        return f"{self.hits} hits, {self.misses} misses"
@@ -0,0 +1,224 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Structured change log."""
+
+import gzip
+import json
+import logging
+import os
+import pathlib
+import re
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, partial
+
+logger = logging.getLogger(__name__)
+
+Statement = namedtuple("Statement", "operation table columns where_id name",
+                       defaults=(None,))
+
+MODIFICATION = re.compile(
+    r"\s*(INSERT|UPDATE|DELETE)\b(?:\s+OR\s+\w+)?\s+(?:INTO\s+|FROM\s+)?"
+    r"(?:\w+\.)?(\w+)", re.IGNORECASE)
+SAVEPOINT = re.compile(
+    r"\s*(SAVEPOINT|RELEASE|ROLLBACK)\b(?:\s+TRANSACTION)?(?:\s+TO)?"
+    r"(?:\s+SAVEPOINT)?\s+(\w+)\s*$", re.IGNORECASE)
+INSERT_COLUMNS = re.compile(r"\(([^()]*)\)\s*VALUES", re.IGNORECASE)
+UPDATE_COLUMNS = re.compile(r"\bSET\b(.*?)(?:\bWHERE\b|$)",
+                            re.IGNORECASE | re.DOTALL)
+ASSIGNMENT = re.compile(r"\s*(\w+)\s*=\s*\?\s*$")
+WHERE_ID = re.compile(r"\bWHERE\s+id\s*=\s*\?\s*$", re.IGNORECASE)
+
+@lru_cache(maxsize=256)
+def parse_statement(sql: str) -> Statement:
+    """Describe a statement, or return None if it changes no rows.
+
+    Results are cached, so the application's fixed set of statements is
+    only parsed once.
+    """
+    match = SAVEPOINT.match(sql)
+    if match:
+        return Statement(match[1].upper(), None, (), False, match[2])
+    match = MODIFICATION.match(sql)
+    if not match:
+        return None
+    operation, table = match[1].upper(), match[2].capitalize()
+    columns = ()
+    if operation == "INSERT":
+        values = INSERT_COLUMNS.search(sql)
+        if values:
+            columns = tuple(c.strip() for c in values[1].split(","))
+    elif operation == "UPDATE":
+        assignments = UPDATE_COLUMNS.search(sql)
+        if assignments:
+            columns = tuple(ASSIGNMENT.match(a)
+                            for a in assignments[1].split(","))
+            columns = (tuple(m[1] for m in columns)
+                       if all(columns) else ())
+    return Statement(operation, table, columns,
+                     WHERE_ID.search(sql) is not None)
+
+class ChangeLog:
+    """Collect modifications of a transaction and write them on commit.
+
+    Recording a statement only appends a tuple, so capturing costs the
+    same regardless of how many statements the transaction has. Entries
+    added after a savepoint are discarded if it is rolled back. Changes to
+    the change log itself, i.e. rotation, aren't logged.
+    """
+
+    def __init__(self, schema="main"):
+        self.schema = schema
+        self.entries = []
+        self.savepoints = []
+        self.unlogged = set()  # tables modified without entries
+
+    def record(self, sql, parameters, lastrowid):
+        statement = parse_statement(sql)
+        if statement is None:
+            return
+        if statement.operation == "SAVEPOINT":
+            self.savepoints.append((statement.name, len(self.entries)))
+        elif statement.operation in ("RELEASE", "ROLLBACK"):
+            for i in reversed(range(len(self.savepoints))):
+                name, mark = self.savepoints[i]
+                if name == statement.name:
+                    if statement.operation == "ROLLBACK":
+                        del self.entries[mark:]
+                        del self.savepoints[i + 1:]
+                    else:
+                        del self.savepoints[i:]
+                    break
+        elif statement.table == "Muutosloki":
+            self.unlogged.add(statement.table)
+        else:
+            self.entries.append((statement, parameters, lastrowid))
+
+    def tables(self) -> set:
+        """Return names of the tables modified in the transaction."""
+        return {statement.table
+                for statement, _, _ in self.entries} | self.unlogged
+
+    def rows(self, timestamp) -> list:
+        """Return Muutosloki rows for the collected entries."""
+        rows = []
+        for statement, parameters, lastrowid in self.entries:
+            row_id = lastrowid if statement.operation == "INSERT" else None
+            if isinstance(parameters, dict):
+                values = parameters
+            else:
+                parameters = list(parameters)
+                if statement.where_id and parameters:
+                    row_id = parameters[-1]
+                columns = statement.columns
+                if columns and len(columns) <= len(parameters):
+                    values = dict(zip(columns, parameters))
+                    # Keep parameters of other WHERE clauses, e.g. a
+                    # subquery, so that the changed row can be told.
+                    rest = parameters[len(columns):]
+                    if rest and not (statement.where_id and len(rest) == 1):
+                        values["WHERE"] = rest
+                else:
+                    values = parameters
+            rows.append((timestamp, statement.table, statement.operation,
+                         row_id, json.dumps(values, ensure_ascii=False,
+                                            default=str)))
+        return rows
+
+    def flush(self, conn):
+        """Write collected entries with one statement."""
+        if self.entries:
+            timestamp = datetime.now(timezone.utc).astimezone().isoformat()
+            rows = self.rows(timestamp)
+            conn.executemany(
+                f"INSERT INTO {self.schema}.Muutosloki "
+                f"(aikaleima, taulu, toiminto, rivi_id, parametrit) "
+                f"VALUES (?, ?, ?, ?, ?)", rows)
+            logger.debug(f"Logged {len(rows)} changes.")
+        self.clear()
+
+    def clear(self):
+        self.entries.clear()
+        self.savepoints.clear()
+        self.unlogged.clear()
+
+def expired(conn, cutoff: str, chunk: int) -> list:
+    """Return up to chunk entries older than cutoff in id order.
+
+    The newest entry is always kept, so that SQLite never reuses the ids
+    of archived entries.
+    """
+    table = f"{conn.changelog.schema}.Muutosloki"
+    last = conn.execute(
+        f"SELECT MAX(id) FROM {table} WHERE aikaleima < ? "
+        f"AND id < (SELECT MAX(id) FROM {table})", (cutoff,)).fetchone()[0]
+    if last is None:
+        return []
+    return [dict(row) for row in conn.execute(
+        f"SELECT * FROM {table} WHERE id <= ? ORDER BY id LIMIT ?",
+        (last, chunk))]
+
+def delete_through(conn, last: int):
+    conn.execute(f"DELETE FROM {conn.changelog.schema}.Muutosloki "
+                 f"WHERE id <= ?", (last,))
+
+def archive(writer, cutoff: str, directory: pathlib.Path, chunk=10000) -> int:
+    """Move up to chunk entries older than cutoff into a compressed file.
+
+    Entries are archived in id order into gzipped JSON lines named after
+    their id range. The file is written between two write jobs, so that
+    other writes can proceed meanwhile. An existing file is only accepted
+    if it holds the same entries, as left by an interrupted run. Returns
+    the number of entries moved.
+    """
+    rows = writer.run(partial(expired, cutoff=cutoff, chunk=chunk))
+    if not rows:
+        return 0
+    first, last = rows[0]["id"], rows[-1]["id"]
+    lines = [json.dumps(row, ensure_ascii=False) + "\n" for row in rows]
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"muutosloki-{first:010}-{last:010}.jsonl.gz"
+    if path.exists():
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            if f.readlines() != lines:
+                raise FileExistsError(f"{path} exists with other entries.")
+    else:
+        temporary = path.with_suffix(".tmp")
+        with gzip.open(temporary, "wt", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(temporary, path)
+    writer.run(partial(delete_through, last=last))
+    logger.info(f"Archived {len(rows)} change log entries to {path}.")
+    return len(rows)
+
+class Rotation(threading.Thread):
+    """Periodically archive entries older than a retention period."""
+
+    def __init__(self, writer, days, directory, interval=24*60*60):
+        super().__init__(name="Changelog rotation", daemon=True)
+        self.writer = writer
+        self.days = days
+        self.directory = pathlib.Path(directory)
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def rotate(self) -> int:
+        cutoff = (datetime.now(timezone.utc).astimezone()
+                  - timedelta(days=self.days)).isoformat()
+        total = 0
+        while True:
+            moved = archive(self.writer, cutoff, self.directory)
+            if not moved:
+                return total
+            total += moved
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.rotate()
+            except Exception:
+                logger.exception("Change log rotation failed.")
+            self.stopped.wait(self.interval)
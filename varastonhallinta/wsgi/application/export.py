@@ -0,0 +1,159 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Streaming export of query results."""
+
+import csv
+import io
+import json
+import math
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from flask import Response, abort, stream_with_context
+
+BATCH_SIZE = 500
+
+HIDDEN_COLUMNS = ("sort_key",)
+
+# Characters that XML 1.0 doesn't allow.
+INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+XLSX_PARTS = {
+    "[Content_Types].xml":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types">'
+        '<Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType='
+        '"application/vnd.openxmlformats-officedocument.spreadsheetml.'
+        'worksheet+xml"/>'
+        '</Types>',
+    "_rels/.rels":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>',
+    "xl/workbook.xml":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/'
+        '2006/main" xmlns:r="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships">'
+        '<sheets><sheet name="Näkymä" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>',
+    "xl/_rels/workbook.xml.rels":
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+        'officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'}
+
+def csv_chunks(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # lets spreadsheet programs detect UTF-8
+    writer.writerow(columns)
+    for rows in batches:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue().encode()
+
+def jsonl_chunks(columns, batches):
+    for rows in batches:
+        yield "".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False)
+                      + "\n" for row in rows).encode()
+
+def xlsx_cell(value) -> str:
+    if value is None:
+        return "<c/>"
+    if (isinstance(value, (int, float)) and not isinstance(value, bool)
+            and math.isfinite(value)):
+        return f"<c><v>{value!r}</v></c>"
+    text = escape(INVALID_XML.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+def xlsx_row(values) -> str:
+    return "<row>" + "".join(xlsx_cell(value) for value in values) + "</row>"
+
+class _Sink:
+    """Unseekable file object that collects what a ZipFile writes."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+def xlsx_chunks(columns, batches):
+    # ZipFile writes data descriptors after each member when it can't
+    # seek back, so the worksheet can be compressed as rows arrive.
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in XLSX_PARTS.items():
+            archive.writestr(name, data)
+        with archive.open("xl/worksheets/sheet1.xml", "w",
+                          force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/'
+                b'spreadsheetml/2006/main"><sheetData>')
+            sheet.write(xlsx_row(columns).encode())
+            for rows in batches:
+                sheet.write("".join(xlsx_row(row) for row in rows).encode())
+                yield sink.take()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.take()
+
+FORMATS = {"csv": ("text/csv; charset=utf-8", csv_chunks),
+           "jsonl": ("application/x-ndjson; charset=utf-8", jsonl_chunks),
+           "xlsx": ("application/vnd.openxmlformats-officedocument."
+                    "spreadsheetml.sheet", xlsx_chunks)}
+
+def export_response(conn, query, format, name) -> Response:
+    """Stream the rows of a SearchHelper query as a file download.
+
+    Rows are fetched in batches while the response is being sent, so
+    memory use doesn't depend on the number of rows.
+    """
+    if format not in FORMATS:
+        abort(404)
+    content_type, chunks = FORMATS[format]
+    cursor = query.stream(conn)
+    names = [d[0] for d in cursor.description]
+    shown = [i for i, column in enumerate(names)
+             if column not in HIDDEN_COLUMNS]
+    columns = [names[i] for i in shown]
+
+    def batches():
+        while True:
+            rows = cursor.fetchmany(BATCH_SIZE)
+            if not rows:
+                break
+            yield [[row[i] for i in shown] for row in rows]
+
+    return Response(
+        stream_with_context(chunks(columns, batches())),
+        content_type=content_type,
+        headers={"Content-Disposition":
+                     f'attachment; filename="{name}.{format}"'})
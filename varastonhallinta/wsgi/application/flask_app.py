@@ -7,67 +7,101 @@
 import logging
 import secrets
 import sqlite3
-from datetime import datetime, timezone
+import threading
 from flask import Flask, g
-from auxiliary.conf import PROJECT_NAME, VERSION
+from auxiliary.conf import PROJECT_NAME, VERSION, DEFAULT_PRAGMAS
+from wsgi.application import cache, metrics
+from wsgi.application.changelog import ChangeLog
+from wsgi.application.pool import ConnectionPool
+from wsgi.application.search import install_regex
+from wsgi.application.writer import Writer
 
 logger = logging.getLogger(__name__)
 
+_pool = None
+_pool_lock = threading.Lock()
+_writer = None
+_writer_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Return the connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                app.config["database"],
+                pragmas=app.config.get("pragmas", DEFAULT_PRAGMAS),
+                cached_statements=app.config.get("cached_statements", 256),
+                factory=LoggingConnection,
+                on_connect=configure_connection)
+        return _pool
+
+def get_writer() -> Writer:
+    """Return the writer that all modifications go through."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = Writer(lambda: get_pool().connection())
+        return _writer
+
+def configure_connection(conn: sqlite3.Connection):
+    """Prepare a new pooled connection."""
+    conn.row_factory = sqlite3.Row  # enables access by index or key
+    install_regex(conn)
+    conn.set_progress_handler(metrics.count_instructions, metrics.VM_STEP)
+    changelog_database = app.config.get("changelog_database")
+    if changelog_database is not None:
+        conn.execute("ATTACH DATABASE ? AS muutosloki",
+                     (str(changelog_database),))
+        conn.changelog.schema = "muutosloki"
+
 def get_db_connection() -> sqlite3.Connection:
-    """Open database connection."""
+    """Get the calling thread's database connection."""
     conn = getattr(g, '_database', None)
     if conn is None:
-        logger.debug("Opening database connection...")
-        conn = g._database = sqlite3.connect(app.config["database"],
-                                             factory=LoggingConnection)
-    conn.row_factory = sqlite3.Row  # enables access by index or key
+        conn = g._database = get_pool().connection()
     return conn
 
 class LoggingConnection(sqlite3.Connection):
-    """Extend superclass for commit logging."""
-
-    class StatementContainer:
-        """Contain statements."""
-        def __init__(self):
-            self._data = []
-
-        def add_data(self, s):
-            s = s.strip()
-            if s not in ("BEGIN", "COMMIT"):
-                lines = s.splitlines()
-                self._data.append(" ".join([line.strip() for line in lines]))
-                logger.debug(self.data)
+    """Extend superclass for change logging."""
 
-        @property
-        def data(self):
-            return "; ".join(self._data)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.changelog = ChangeLog()
+        self.changes_seen = 0
 
-        def clear_data(self):
-            self._data.clear()
-
-    def cursor(self):
-        self.container = self.StatementContainer()
-        self.set_trace_callback(self.container.add_data)
-        return super().cursor()
+    def execute(self, sql, parameters=()):
+        cursor = self.cursor(metrics.TimedCursor)
+        cursor.execute(sql, parameters)
+        self.changelog.record(sql, parameters, cursor.lastrowid)
+        return cursor
 
     def commit(self):
-        self.execute(
-            "INSERT INTO Muutosloki (aikaleima, komento) VALUES (?, ?)",
-            (datetime.now(timezone.utc).astimezone().isoformat(),
-             self.container.data))
-        self.container.clear_data()
+        # Statements that bypass execute() aren't recorded, so a commit
+        # without entries invalidates everything, unless it changed no rows.
+        tables = self.changelog.tables() or None
+        if tables is None and self.total_changes == self.changes_seen:
+            tables = ()
+        self.changelog.flush(self)
         super().commit()
+        self.changes_seen = self.total_changes
+        cache.bump(tables)
+
+    def rollback(self):
+        self.changelog.clear()
+        super().rollback()
 
 app = Flask(__name__)
+app.jinja_env.template_class = metrics.TimedTemplate
 app.config["SECRET_KEY"] = secrets.token_urlsafe(16)  # for the session cookie
 
 @app.teardown_appcontext
-def close_connection(exception):
-    """Close database connection on application context destruction."""
+def release_connection(exception):
+    """Release database connection on application context destruction."""
     conn = getattr(g, '_database', None)
     if conn is not None:
-        logger.debug("Closing database connection...")
-        conn.close()
+        get_pool().release()
+        logger.debug(f"Connection pool: {get_pool().stats()}")
 
 @app.context_processor
 def inject_variables():
@@ -0,0 +1,23 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Cached reference data and order picker results."""
+
+from wsgi.application.cache import Cache
+
+reference_data = Cache("Reference data",
+                       tables=("Tilat", "Sijainnit", "Toimitustavat"))
+open_orders = Cache("Open orders", tables=("Tilaukset", "Asiakkaat"))
+
+def fetch_all(cache, conn, command) -> list:
+    return cache.get(conn, command, lambda: conn.execute(command).fetchall())
+
+def tilat(conn) -> list:
+    return fetch_all(reference_data, conn, "SELECT * FROM Tilat")
+
+def sijainnit(conn) -> list:
+    return fetch_all(reference_data, conn, "SELECT * FROM Sijainnit")
+
+def toimitustavat(conn) -> list:
+    return fetch_all(reference_data, conn, "SELECT * FROM Toimitustavat")
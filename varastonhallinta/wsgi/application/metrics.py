@@ -0,0 +1,228 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Request and query metrics."""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import sqlite3
+import jinja2
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("slowquery")
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PHASES = ("sql", "template", "json")
+VM_STEP = 1000  # virtual machine instructions per progress handler call
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+slow_query_threshold = None  # seconds, or None to not log slow queries
+
+_lock = threading.Lock()
+_local = threading.local()
+_requests = defaultdict(int)  # (route, method, status) => count
+_latency = {}  # route => [count per bucket..., +Inf count, sum]
+_phases = defaultdict(float)  # (route, phase) => seconds
+_rows = defaultdict(int)  # route => rows returned
+_instructions = defaultdict(int)  # route => VM instructions
+
+def _current() -> dict:
+    """Return the calling thread's counters of the current request."""
+    counters = getattr(_local, "counters", None)
+    if counters is None:
+        counters = _local.counters = dict.fromkeys(
+            PHASES + ("rows", "instructions"), 0)
+    return counters
+
+def start_request():
+    _local.counters = None
+
+def add(name, amount):
+    _current()[name] += amount
+
+@contextmanager
+def timed(phase):
+    """Add time spent in the block to a phase of the current request."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(phase, time.perf_counter() - started)
+
+def count_instructions() -> int:
+    """Progress handler that counts virtual machine instructions."""
+    _current()["instructions"] += VM_STEP
+    return 0
+
+def finish_request(route, method, status, seconds):
+    """Record a finished request with the counters of its thread."""
+    counters = _current()
+    with _lock:
+        _requests[(route, method, status)] += 1
+        latency = _latency.setdefault(route, [0]*(len(BUCKETS) + 2))
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                latency[i] += 1
+        latency[-2] += 1
+        latency[-1] += seconds
+        for phase in PHASES:
+            _phases[(route, phase)] += counters[phase]
+        _rows[route] += counters["rows"]
+        _instructions[route] += counters["instructions"]
+    _local.counters = None
+
+def plan(conn, sql, parameters) -> str:
+    """Return the query plan of a statement as an indented tree."""
+    depths = {0: -1}
+    lines = []
+    for node, parent, _, detail in sqlite3.Connection.execute(
+            conn, "EXPLAIN QUERY PLAN " + sql, parameters):
+        depths[node] = depths.get(parent, -1) + 1
+        lines.append("  "*depths[node] + detail)
+    return "\n".join(lines)
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that adds its time and rows to the current request.
+
+    Statements that take longer than slow_query_threshold in total are
+    logged with their parameters and query plan.
+    """
+
+    _sql = None
+    _elapsed = 0.0
+    _logged = False
+
+    def execute(self, sql, parameters=()):
+        self._sql, self._parameters = sql, parameters
+        self._elapsed, self._logged = 0.0, False
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._spent(started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._spent(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        rows = (super().fetchmany() if size is None
+                else super().fetchmany(size))
+        self._spent(started, len(rows), not rows)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._spent(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._spent(started, 0, True)
+            raise
+        self._spent(started, 1)
+        return row
+
+    def _spent(self, started, rows=0, done=False):
+        elapsed = time.perf_counter() - started
+        self._elapsed += elapsed
+        counters = _current()
+        counters["sql"] += elapsed
+        counters["rows"] += rows
+        if (slow_query_threshold is not None and not self._logged
+                and self._elapsed > slow_query_threshold
+                and (done or self.description is None)):
+            self._logged = True
+            self._log_slow()
+
+    def _log_slow(self):
+        message = (f"Slow query ({self._elapsed*1000:.0f} ms): "
+                   f"{' '.join(self._sql.split())}\n"
+                   f"Parameters: {self._parameters!r}")
+        if self._sql.lstrip().upper().startswith(EXPLAINABLE):
+            try:
+                message += ("\nQuery plan:\n"
+                            + plan(self.connection, self._sql,
+                                   self._parameters))
+            except sqlite3.Error as e:
+                message += f"\nQuery plan unavailable: {e}"
+        slow_query_logger.warning(message)
+
+class TimedTemplate(jinja2.Template):
+    """Template that adds its rendering time to the current request."""
+
+    def render(self, *args, **kwargs):
+        with timed("template"):
+            return super().render(*args, **kwargs)
+
+def _label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_label(v)}"'
+                          for k, v in labels.items()) + "}"
+
+def exposition(collected=()) -> str:
+    """Return metrics in the Prometheus text format.
+
+    Metrics collected elsewhere are given as (name, type, help, samples)
+    tuples, where samples is a list of (labels, value) pairs.
+    """
+    lines = []
+
+    def header(name, kind, help):
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    with _lock:
+        header("varastonhallinta_requests_total", "counter",
+               "Requests by route, method and status.")
+        for (route, method, status), count in sorted(_requests.items()):
+            labels = _labels(route=route, method=method, status=status)
+            lines.append(f"varastonhallinta_requests_total{labels} {count}")
+        header("varastonhallinta_request_duration_seconds", "histogram",
+               "Request latency by route.")
+        for route, latency in sorted(_latency.items()):
+            name = "varastonhallinta_request_duration_seconds"
+            for bound, count in zip(BUCKETS, latency):
+                lines.append(f"{name}_bucket"
+                             f"{_labels(route=route, le=bound)} {count}")
+            lines.append(f"{name}_bucket{_labels(route=route, le='+Inf')} "
+                         f"{latency[-2]}")
+            lines.append(f"{name}_sum{_labels(route=route)} {latency[-1]}")
+            lines.append(f"{name}_count{_labels(route=route)} "
+                         f"{latency[-2]}")
+        header("varastonhallinta_request_phase_seconds_total", "counter",
+               "Time spent in SQL, template rendering and JSON "
+               "serialization by route.")
+        for (route, phase), seconds in sorted(_phases.items()):
+            lines.append(f"varastonhallinta_request_phase_seconds_total"
+                         f"{_labels(route=route, phase=phase)} {seconds}")
+        header("varastonhallinta_sql_rows_returned_total", "counter",
+               "Rows fetched from SQLite by route.")
+        for route, rows in sorted(_rows.items()):
+            lines.append(f"varastonhallinta_sql_rows_returned_total"
+                         f"{_labels(route=route)} {rows}")
+        header("varastonhallinta_sql_instructions_total", "counter",
+               f"SQLite virtual machine instructions by route, a measure of "
+               f"rows scanned (counted in steps of {VM_STEP}).")
+        for route, instructions in sorted(_instructions.items()):
+            lines.append(f"varastonhallinta_sql_instructions_total"
+                         f"{_labels(route=route)} {instructions}")
+    for name, kind, help, samples in collected:
+        header(name, kind, help)
+        for labels, value in samples:
+            lines.append(f"{name}{_labels(**labels) if labels else ''} "
+                         f"{value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,72 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Per-thread database connection pool."""
+
+import logging
+import re
+import sqlite3
+import threading
+import weakref
+
+logger = logging.getLogger(__name__)
+
+class ConnectionPool:
+    """Keep one long-lived connection per thread.
+
+    Waitress serves requests from a fixed set of worker threads, so each
+    thread opens its connection once and reuses it with a warm page and
+    statement cache.
+    """
+
+    def __init__(self, database, pragmas=None, cached_statements=128,
+                 factory=sqlite3.Connection, on_connect=None):
+        self.database = database
+        self.pragmas = dict(pragmas or {})
+        for name in self.pragmas:
+            if not re.fullmatch(r"\w+", name):
+                raise ValueError(f"Invalid pragma name: {name}")
+        self.cached_statements = cached_statements
+        self.factory = factory
+        self.on_connect = on_connect
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+
+    @property
+    def size(self) -> int:
+        return len(self._connections)
+
+    def connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it if needed."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            self.hits += 1
+            return conn
+        self.misses += 1
+        conn = sqlite3.connect(self.database,
+                               factory=self.factory,
+                               cached_statements=self.cached_statements)
+        for name, value in self.pragmas.items():
+            result = conn.execute(f"PRAGMA {name} = {value}").fetchone()
+            logger.debug(f"PRAGMA {name} = {value}: {result}")
+        if self.on_connect is not None:
+            self.on_connect(conn)
+        self._local.connection = conn
+        self._connections.add(conn)
+        logger.debug(f"Opened pooled connection in "
+                     f"{threading.current_thread().name}; {self.stats()}")
+        return conn
+
+    def release(self):
+        """Return the calling thread's connection to a clean state."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None and conn.in_transaction:
+            logger.debug("Rolling back unfinished transaction...")
+            conn.rollback()
+
+    def stats(self) -> str:
+        return (f"pool size {self.size}, {self.hits} hits, "
+                f"{self.misses} misses")
@@ -0,0 +1,140 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Compact, conditional and compressed responses."""
+
+import functools
+import gzip
+import hashlib
+import logging
+import zlib
+from urllib.parse import urlencode
+from flask import Response, jsonify, make_response, request
+from auxiliary.conf import VERSION
+from wsgi.application import cache, metrics
+from wsgi.application.export import HIDDEN_COLUMNS
+from wsgi.application.flask_app import app, get_db_connection
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript",
+                      "application/x-ndjson", "image/svg+xml")
+MINIMUM_SIZE = 1024  # smaller bodies don't gain enough to be worth it
+
+# Paging hints that only tell how to compute the same response faster.
+PAGING_PARAMETERS = frozenset(("cursor", "total", "total_token"))
+
+def listing_response(rows, **fields) -> Response:
+    """Return rows and other fields of a listing as JSON.
+
+    With layout=columns in the query string, column names are sent once
+    and each row as an array of values instead of an object.
+    """
+    names = [k for k in (rows[0].keys() if rows else ())
+             if k not in HIDDEN_COLUMNS]
+    if request.args.get("layout") == "columns":
+        fields["columns"] = names
+        fields["rows"] = [[row[k] for k in names] for row in rows]
+    else:
+        fields["rows"] = [{k: row[k] for k in names} for row in rows]
+    with metrics.timed("json"):
+        return jsonify(fields)
+
+def conditional(view):
+    """Answer with 304 Not Modified if the database hasn't changed.
+
+    The entity tag is derived from the database, its contents, the request
+    path and the query parameters that affect the response, so the view
+    doesn't run at all for a client that already has the current response,
+    whichever worker process answers.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        parameters = sorted((k, v) for k, v in request.args.items(multi=True)
+                            if k not in PAGING_PARAMETERS)
+        key = (f"{VERSION}:{app.config['database']}:"
+               f"{cache.state(get_db_connection())}:{request.path}?"
+               f"{urlencode(parameters)}")
+        etag = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+        # Weak, because the body may be sent in different encodings.
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    return wrapper
+
+def accepted_encoding():
+    """Return the best content coding the client accepts, or None."""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, compresslevel=6)
+
+def compress_chunks(chunks, encoding: str):
+    """Compress an iterable of byte strings as it is consumed."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        process, finish = compressor.process, compressor.finish
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        process, finish = compressor.compress, compressor.flush
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = process(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+def is_compressible(response: Response) -> bool:
+    mimetype = response.mimetype or ""
+    return mimetype.startswith("text/") or mimetype in COMPRESSIBLE_TYPES
+
+@app.after_request
+def compress_response(response: Response) -> Response:
+    """Compress textual responses for clients that accept it.
+
+    Streamed responses are compressed chunk by chunk, so they stay
+    streamed. File responses are left alone.
+    """
+    if (response.direct_passthrough
+            or response.status_code < 200
+            or response.status_code in (204, 206, 304)
+            or "Content-Encoding" in response.headers
+            or not is_compressible(response)):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < MINIMUM_SIZE:
+            return response
+        response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
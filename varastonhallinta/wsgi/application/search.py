@@ -1,38 +1,265 @@
+import base64
+import hashlib
+import json
 import logging
+import warnings
 from time import perf_counter
 import regex as re
+from wsgi.application.cache import Cache, generation
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Atomic groups and possessive repeats were added in Python 3.11.
+ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+REPEATS = tuple(op for op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT,
+                              getattr(sre_parse, "POSSESSIVE_REPEAT", None))
+                if op is not None)
 
 logger = logging.getLogger(__name__)
 
+row_counts = Cache("Row count")
+
+# ASCII letters that also match non-ASCII characters when ignoring case
+# (e.g. "k" matches KELVIN SIGN), so SQLite's lower() can't stand in for them.
+UNSAFE_CASELESS = frozenset("IKSiks")
+
+def required_literals(pattern: str, ignore_case: bool) -> list:
+    """Return substrings that every match of a regular expression contains.
+
+    The pattern is parsed with the standard library parser. Anything it
+    can't parse, or parses differently from the regex module, contributes
+    no literals, so the result is always safe to use as a prefilter.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # e.g. possible nested set
+            parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+    if parsed.state.flags & sre_parse.SRE_FLAG_IGNORECASE:
+        ignore_case = True
+    if parsed.state.flags & sre_parse.SRE_FLAG_VERBOSE:
+        return []
+
+    def usable(char):
+        if char in "[]{}":  # may be regex module syntax taken literally
+            raise ValueError(char)
+        if ignore_case:
+            return char.isascii() and char not in UNSAFE_CASELESS
+        return True
+
+    def walk(items):
+        literals, run = [], []
+
+        def flush():
+            if len(run) >= 2:
+                literals.append("".join(run))
+            run.clear()
+
+        for op, av in items:
+            if op is sre_parse.LITERAL and usable(chr(av)):
+                run.append(chr(av))
+                continue
+            flush()
+            if op is sre_parse.SUBPATTERN:
+                _, add_flags, del_flags, subpattern = av
+                if not add_flags and not del_flags:
+                    literals.extend(walk(subpattern))
+            elif ATOMIC_GROUP is not None and op is ATOMIC_GROUP:
+                literals.extend(walk(av))
+            elif op in REPEATS and av[0] >= 1:
+                literals.extend(walk(av[2]))
+        flush()
+        return literals
+
+    try:
+        literals = walk(parsed)
+    except Exception:
+        return []
+    return [s.lower() for s in literals] if ignore_case else literals
+
+class RegexFunction:
+    """SQL function REG(item) that searches item for the current pattern."""
+
+    def __init__(self):
+        self.pattern = None
+        self.calls = 0
+
+    def __call__(self, item):
+        self.calls += 1
+        return self.pattern.search(item or "") is not None
+
+def install_regex(conn):
+    """Register REG on a connection once, to be reused by every search."""
+    conn.regex_function = RegexFunction()
+    conn.create_function("REG", 1, conn.regex_function)
+
+def encode_cursor(state: dict) -> str:
+    """Encode pagination state as an opaque continuation token."""
+    data = json.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode()
+
+def decode_cursor(token: str) -> dict:
+    """Decode a continuation token, or return None if it is malformed."""
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if not isinstance(state["o"], int) or len(state["k"]) != 2:
+            return None
+    except Exception:
+        return None
+    return state
+
 class SearchHelper:
     def __init__(self):
         self.command_parts = []
         self.search_conditions = []
         self.parameters = []
         self.precompiled_regex_pattern = None
+        self.regex_literals = []
+        self.from_clause = ""
+        self.filter_where_clause = ""
+        self.filter_parameters = []
+        self.seek_condition = None
+        self.seek_parameters = []
+        self.seek_fingerprint = None
         self.no_results = False
 
+    def register_regex(self, conn):
+        if self.precompiled_regex_pattern:
+            if not hasattr(conn, "regex_function"):
+                install_regex(conn)
+            conn.regex_function.pattern = self.precompiled_regex_pattern
+            conn.regex_function.calls = 0
+
     def execute(self, conn):
-        reg = self.precompiled_regex_pattern
-        if reg:
-            conn.create_function(
-                "REG", 1, lambda item: reg.search(item or "") is not None)
+        self.register_regex(conn)
         command = "".join(self.command_parts)
         start = perf_counter()
         rows = conn.execute(command, self.parameters).fetchall()
         stop = perf_counter()
         logger.debug(f"Query time: {stop - start} s")
+        if self.precompiled_regex_pattern:
+            logger.debug(f"Regex prefilter {self.regex_literals}: "
+                         f"{conn.regex_function.calls} REG calls for "
+                         f"{len(rows)} rows")
         return rows
 
+    def stream(self, conn):
+        """Execute the query and return the cursor to fetch rows from."""
+        self.register_regex(conn)
+        return conn.execute("".join(self.command_parts), self.parameters)
+
+    def count(self, conn, expression="*"):
+        """Count rows matching the search conditions, ignoring pagination."""
+        command = (f"SELECT COUNT({expression}) {self.from_clause} "
+                   f"{self.filter_where_clause}")
+        parameters = self.filter_parameters
+
+        def compute():
+            self.register_regex(conn)
+            start = perf_counter()
+            total = conn.execute(command, parameters).fetchone()[0]
+            stop = perf_counter()
+            logger.debug(f"Count time: {stop - start} s")
+            return total
+
+        return row_counts.get(conn, (command, tuple(parameters)), compute)
+
+    def total(self, conn, known=None, token=None, expression="*"):
+        """Return the row count and a token identifying it.
+
+        A client that echoes back the previous total and its token gets the
+        count skipped as long as neither the search nor the data changed.
+        """
+        current = generation(conn)
+        if known is not None and token == self.total_token(current, known):
+            return known, token
+        total = self.count(conn, expression)
+        return total, self.total_token(current, total)
+
+    def total_token(self, generation, total) -> str:
+        data = json.dumps([self.from_clause, self.filter_where_clause,
+                           self.filter_parameters, generation, total],
+                          default=str)
+        return hashlib.sha1(data.encode()).hexdigest()
+
     def append(self, part, parameters=None):
         self.command_parts.append(part)
         if parameters is not None:
             self.parameters.extend(parameters)
 
+    def append_from(self, part):
+        self.from_clause = part
+        self.command_parts.append(part)
+
+    def fingerprint(self, *extra) -> str:
+        """Identify the search conditions added so far."""
+        data = json.dumps([self.search_conditions, self.parameters, extra],
+                          default=str)
+        return hashlib.sha1(data.encode()).hexdigest()
+
+    def seek(self, column, tiebreaker, descending, token, offset):
+        """Continue after the row a continuation token points to.
+
+        The token is only honoured if it was issued for the same search,
+        ordering and offset, so jumping to an arbitrary page falls back to
+        OFFSET. Returns the offset still to be applied.
+        """
+        self.seek_fingerprint = self.fingerprint(column, tiebreaker,
+                                                 descending)
+        state = token and decode_cursor(token)
+        if (not state or state.get("f") != self.seek_fingerprint
+                or state["o"] != offset):
+            return offset
+
+        # Rows are ordered by (column, tiebreaker), NULLs first in
+        # ascending and last in descending order. The column expression
+        # carries its own collation.
+        value, last_id = state["k"]
+        op = "<" if descending else ">"
+        key = column
+        if value is None and descending:
+            self.seek_condition = f"({key} IS NULL AND {tiebreaker} < ?)"
+            self.seek_parameters = [last_id]
+        elif value is None:
+            self.seek_condition = (f"({key} IS NULL AND {tiebreaker} > ? "
+                                   f"OR {key} IS NOT NULL)")
+            self.seek_parameters = [last_id]
+        else:
+            nulls = f" OR {key} IS NULL" if descending else ""
+            self.seek_condition = (f"({key} {op} ? OR {key} = ? "
+                                   f"AND {tiebreaker} {op} ?{nulls})")
+            self.seek_parameters = [value, value, last_id]
+        return 0
+
+    def cursor(self, rows, offset, limit, key="sort_key", tiebreaker="id"):
+        """Return a continuation token for the page after rows."""
+        if (self.seek_fingerprint is None or offset is None or not limit
+                or len(rows) < limit):
+            return None
+        last = rows[-1]
+        return encode_cursor({"f": self.seek_fingerprint,
+                              "o": offset + len(rows),
+                              "k": [last[key], last[tiebreaker]]})
+
     def append_where_clause(self):
         if self.search_conditions:
-            self.command_parts.append(
+            self.filter_where_clause = (
                 "WHERE " + " AND ".join(self.search_conditions))
+        self.filter_parameters = list(self.parameters)
+        conditions = self.search_conditions
+        if self.seek_condition:
+            conditions = conditions + [self.seek_condition]
+            self.parameters.extend(self.seek_parameters)
+        if conditions:
+            self.command_parts.append("WHERE " + " AND ".join(conditions))
+
+    def add_condition(self, condition, parameters=None):
+        self.search_conditions.append(condition)
+        if parameters is not None:
+            self.parameters.extend(parameters)
 
     def add_multiselect(self, column, valuestring, maxvalues):
         values = valuestring.split(",")
@@ -65,12 +292,41 @@ class SearchHelper:
             self.search_conditions.append(f"{column} <= ?")
             self.parameters.append(end)
 
-    def set_regex(self, data, pattern, ignore_case):
+    def set_fulltext(self, column, index, fields, text):
+        if len(text) >= 3:
+            self.search_conditions.append(
+                f"{column} IN "
+                f"(SELECT rowid FROM {index} WHERE {index} MATCH ?)")
+            self.parameters.append('"{}"'.format(text.replace('"', '""')))
+        elif text:
+            # Trigram queries need at least three characters, so shorter ones
+            # scan the index contents with LIKE instead.
+            pattern = "%{}%".format(text.replace("\\", "\\\\")
+                                        .replace("%", "\\%")
+                                        .replace("_", "\\_"))
+            likes = " OR ".join(f"{f} LIKE ? ESCAPE '\\'" for f in fields)
+            self.search_conditions.append(
+                f"{column} IN (SELECT rowid FROM {index} WHERE {likes})")
+            self.parameters.extend([pattern]*len(fields))
+
+    def set_regex(self, fields, pattern, ignore_case):
         flags = (re.IGNORECASE,) if ignore_case else ()
         try:
             self.precompiled_regex_pattern = re.compile(pattern, *flags)
         except re.error as e:
             logger.debug(f"Invalid regular expression: {e}")
             self.no_results = True
-        else:
-            self.search_conditions.append(f"{data}")
+            return
+
+        # A field can only match if it contains every required literal, and
+        # instr() is much cheaper than a call into Python.
+        self.regex_literals = required_literals(pattern, ignore_case)
+        conditions = []
+        for field in fields:
+            haystack = f"lower({field})" if ignore_case else field
+            prefilters = [f"instr({haystack}, ?) > 0"
+                          for _ in self.regex_literals]
+            conditions.append(" AND ".join(prefilters + [f"REG({field})"]))
+            self.parameters.extend(self.regex_literals)
+        self.search_conditions.append(
+            "(" + "\n OR ".join(f"({c})" for c in conditions) + ")")
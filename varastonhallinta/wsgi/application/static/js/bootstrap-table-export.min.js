@@ -1,10 +0,0 @@
-/**
-  * bootstrap-table - An extended table to integration with some of the most widely used CSS frameworks. (Supports Bootstrap, Semantic UI, Bulma, Material Design, Foundation)
-  *
-  * @version v1.18.3
-  * @homepage https://bootstrap-table.com
-  * @author wenzhixin <wenzhixin2010@gmail.com> (http://wenzhixin.net.cn/)
-  * @license MIT
-  */
-
-!function(t,e){"object"==typeof exports&&"undefined"!=typeof module?e(require("jquery")):"function"==typeof define&&define.amd?define(["jquery"],e):e((t="undefined"!=typeof globalThis?globalThis:t||self).jQuery)}(this,(function(t){"use strict";function e(t){return t&&"object"==typeof t&&"default"in t?t:{default:t}}var n=e(t);function r(t,e){if(!(t instanceof e))throw new TypeError("Cannot call a class as a function")}function o(t,e){for(var n=0;n<e.length;n++){var r=e[n];r.enumerable=r.enumerable||!1,r.configurable=!0,"value"in r&&(r.writable=!0),Object.defineProperty(t,r.key,r)}}function i(t,e,n){return e in t?Object.defineProperty(t,e,{value:n,enumerable:!0,configurable:!0,writable:!0}):t[e]=n,t}function a(t){return(a=Object.setPrototypeOf?Object.getPrototypeOf:function(t){return t.__proto__||Object.getPrototypeOf(t)})(t)}function c(t,e){return(c=Object.setPrototypeOf||function(t,e){return t.__proto__=e,t})(t,e)}function l(t,e){return!e||"object"!=typeof e&&"function"!=typeof e?function(t){if(void 0===t)throw new ReferenceError("this hasn't been initialised - super() hasn't been called");return t}(t):e}function u(t){var e=function(){if("undefined"==typeof Reflect||!Reflect.construct)return!1;if(Reflect.construct.sham)return!1;if("function"==typeof Proxy)return!0;try{return Boolean.prototype.valueOf.call(Reflect.construct(Boolean,[],(function(){}))),!0}catch(t){return!1}}();return function(){var n,r=a(t);if(e){var o=a(this).constructor;n=Reflect.construct(r,arguments,o)}else n=r.apply(this,arguments);return l(this,n)}}function f(t,e,n){return(f="undefined"!=typeof Reflect&&Reflect.get?Reflect.get:function(t,e,n){var r=function(t,e){for(;!Object.prototype.hasOwnProperty.call(t,e)&&null!==(t=a(t)););return t}(t,e);if(r){var o=Object.getOwnPropertyDescriptor(r,e);return o.get?o.get.call(n):o.value}})(t,e,n||t)}function s(t,e){(null==e||e>t.length)&&(e=t.length);for(var n=0,r=new Array(e);n<e;n++)r[n]=t[n];return r}function p(t,e){var n;if("undefined"==typeof Symbol||null==t[Symbol.iterator]){if(Array.isArray(t)||(n=function(t,e){if(t){if("string"==typeof t)return s(t,e);var n=Object.prototype.toString.call(t).slice(8,-1);return"Object"===n&&t.constructor&&(n=t.constructor.name),"Map"===n||"Set"===n?Array.from(t):"Arguments"===n||/^(?:Ui|I)nt(?:8|16|32)(?:Clamped)?Array$/.test(n)?s(t,e):void 0}}(t))||e&&t&&"number"==typeof t.length){n&&(t=n);var r=0,o=function(){};return{s:o,n:function(){return r>=t.length?{done:!0}:{done:!1,value:t[r++]}},e:function(t){throw t},f:o}}throw new TypeError("Invalid attempt to iterate non-iterable instance.\nIn order to be iterable, non-array objects must have a [Symbol.iterator]() method.")}var i,a=!0,c=!1;return{s:function(){n=t[Symbol.iterator]()},n:function(){var t=n.next();return a=t.done,t},e:function(t){c=!0,i=t},f:function(){try{a||null==n.return||n.return()}finally{if(c)throw i}}}}var d="undefined"!=typeof globalThis?globalThis:"undefined"!=typeof window?window:"undefined"!=typeof global?global:"undefined"!=typeof self?self:{};function h(t,e){return t(e={exports:{}},e.exports),e.exports}var g=function(t){return t&&t.Math==Math&&t},v=g("object"==typeof globalThis&&globalThis)||g("object"==typeof window&&window)||g("object"==typeof self&&self)||g("object"==typeof d&&d)||function(){return this}()||Function("return this")(),y=function(t){try{return!!t()}catch(t){return!0}},b=!y((function(){return 7!=Object.defineProperty({},1,{get:function(){return 7}})[1]})),x={}.propertyIsEnumerable,m=Object.getOwnPropertyDescriptor,E={f:m&&!x.call({1:2},1)?function(t){var e=m(this,t);return!!e&&e.enumerable}:x},w=function(t,e){return{enumerable:!(1&t),configurable:!(2&t),writable:!(4&t),value:e}},S={}.toString,T=function(t){return S.call(t).slice(8,-1)},O="".split,j=y((function(){return!Object("z").propertyIsEnumerable(0)}))?function(t){return"String"==T(t)?O.call(t,""):Object(t)}:Object,P=function(t){if(null==t)throw TypeError("Can't call method on "+t);return t},A=function(t){return j(P(t))},R=function(t){return"object"==typeof t?null!==t:"function"==typeof t},C=function(t,e){if(!R(t))return t;var n,r;if(e&&"function"==typeof(n=t.toString)&&!R(r=n.call(t)))return r;if("function"==typeof(n=t.valueOf)&&!R(r=n.call(t)))return r;if(!e&&"function"==typeof(n=t.toString)&&!R(r=n.call(t)))return r;throw TypeError("Can't convert object to primitive value")},I={}.hasOwnProperty,L=function(t,e){return I.call(t,e)},M=v.document,D=R(M)&&R(M.createElement),_=function(t){return D?M.createElement(t):{}},$=!b&&!y((function(){return 7!=Object.defineProperty(_("div"),"a",{get:function(){return 7}}).a})),k=Object.getOwnPropertyDescriptor,N={f:b?k:function(t,e){if(t=A(t),e=C(e,!0),$)try{return k(t,e)}catch(t){}if(L(t,e))return w(!E.f.call(t,e),t[e])}},F=function(t){if(!R(t))throw TypeError(String(t)+" is not an object");return t},B=Object.defineProperty,V={f:b?B:function(t,e,n){if(F(t),e=C(e,!0),F(n),$)try{return B(t,e,n)}catch(t){}if("get"in n||"set"in n)throw TypeError("Accessors not supported");return"value"in n&&(t[e]=n.value),t}},U=b?function(t,e,n){return V.f(t,e,w(1,n))}:function(t,e,n){return t[e]=n,t},G=function(t,e){try{U(v,t,e)}catch(n){v[t]=e}return e},H="__core-js_shared__",q=v[H]||G(H,{}),X=Function.toString;"function"!=typeof q.inspectSource&&(q.inspectSource=function(t){return X.call(t)});var K,W,z,Y=q.inspectSource,Q=v.WeakMap,J="function"==typeof Q&&/native code/.test(Y(Q)),Z=h((function(t){(t.exports=function(t,e){return q[t]||(q[t]=void 0!==e?e:{})})("versions",[]).push({version:"3.9.1",mode:"global",copyright:"© 2021 Denis Pushkarev (zloirock.ru)"})})),tt=0,et=Math.random(),nt=function(t){return"Symbol("+String(void 0===t?"":t)+")_"+(++tt+et).toString(36)},rt=Z("keys"),ot=function(t){return rt[t]||(rt[t]=nt(t))},it={},at=v.WeakMap;if(J){var ct=q.state||(q.state=new at),lt=ct.get,ut=ct.has,ft=ct.set;K=function(t,e){return e.facade=t,ft.call(ct,t,e),e},W=function(t){return lt.call(ct,t)||{}},z=function(t){return ut.call(ct,t)}}else{var st=ot("state");it[st]=!0,K=function(t,e){return e.facade=t,U(t,st,e),e},W=function(t){return L(t,st)?t[st]:{}},z=function(t){return L(t,st)}}var pt,dt,ht={set:K,get:W,has:z,enforce:function(t){return z(t)?W(t):K(t,{})},getterFor:function(t){return function(e){var n;if(!R(e)||(n=W(e)).type!==t)throw TypeError("Incompatible receiver, "+t+" required");return n}}},gt=h((function(t){var e=ht.get,n=ht.enforce,r=String(String).split("String");(t.exports=function(t,e,o,i){var a,c=!!i&&!!i.unsafe,l=!!i&&!!i.enumerable,u=!!i&&!!i.noTargetGet;"function"==typeof o&&("string"!=typeof e||L(o,"name")||U(o,"name",e),(a=n(o)).source||(a.source=r.join("string"==typeof e?e:""))),t!==v?(c?!u&&t[e]&&(l=!0):delete t[e],l?t[e]=o:U(t,e,o)):l?t[e]=o:G(e,o)})(Function.prototype,"toString",(function(){return"function"==typeof this&&e(this).source||Y(this)}))})),vt=v,yt=function(t){return"function"==typeof t?t:void 0},bt=function(t,e){return arguments.length<2?yt(vt[t])||yt(v[t]):vt[t]&&vt[t][e]||v[t]&&v[t][e]},xt=Math.ceil,mt=Math.floor,Et=function(t){return isNaN(t=+t)?0:(t>0?mt:xt)(t)},wt=Math.min,St=function(t){return t>0?wt(Et(t),9007199254740991):0},Tt=Math.max,Ot=Math.min,jt=function(t,e){var n=Et(t);return n<0?Tt(n+e,0):Ot(n,e)},Pt=function(t){return function(e,n,r){var o,i=A(e),a=St(i.length),c=jt(r,a);if(t&&n!=n){for(;a>c;)if((o=i[c++])!=o)return!0}else for(;a>c;c++)if((t||c in i)&&i[c]===n)return t||c||0;return!t&&-1}},At={includes:Pt(!0),indexOf:Pt(!1)}.indexOf,Rt=function(t,e){var n,r=A(t),o=0,i=[];for(n in r)!L(it,n)&&L(r,n)&&i.push(n);for(;e.length>o;)L(r,n=e[o++])&&(~At(i,n)||i.push(n));return i},Ct=["constructor","hasOwnProperty","isPrototypeOf","propertyIsEnumerable","toLocaleString","toString","valueOf"],It=Ct.concat("length","prototype"),Lt={f:Object.getOwnPropertyNames||function(t){return Rt(t,It)}},Mt={f:Object.getOwnPropertySymbols},Dt=bt("Reflect","ownKeys")||function(t){var e=Lt.f(F(t)),n=Mt.f;return n?e.concat(n(t)):e},_t=function(t,e){for(var n=Dt(e),r=V.f,o=N.f,i=0;i<n.length;i++){var a=n[i];L(t,a)||r(t,a,o(e,a))}},$t=/#|\.prototype\./,kt=function(t,e){var n=Ft[Nt(t)];return n==Vt||n!=Bt&&("function"==typeof e?y(e):!!e)},Nt=kt.normalize=function(t){return String(t).replace($t,".").toLowerCase()},Ft=kt.data={},Bt=kt.NATIVE="N",Vt=kt.POLYFILL="P",Ut=kt,Gt=N.f,Ht=function(t,e){var n,r,o,i,a,c=t.target,l=t.global,u=t.stat;if(n=l?v:u?v[c]||G(c,{}):(v[c]||{}).prototype)for(r in e){if(i=e[r],o=t.noTargetGet?(a=Gt(n,r))&&a.value:n[r],!Ut(l?r:c+(u?".":"#")+r,t.forced)&&void 0!==o){if(typeof i==typeof o)continue;_t(i,o)}(t.sham||o&&o.sham)&&U(i,"sham",!0),gt(n,r,i,t)}},qt=function(t){if("function"!=typeof t)throw TypeError(String(t)+" is not a function");return t},Xt=function(t){return Object(P(t))},Kt=Array.isArray||function(t){return"Array"==T(t)},Wt="process"==T(v.process),zt=bt("navigator","userAgent")||"",Yt=v.process,Qt=Yt&&Yt.versions,Jt=Qt&&Qt.v8;Jt?dt=(pt=Jt.split("."))[0]+pt[1]:zt&&(!(pt=zt.match(/Edge\/(\d+)/))||pt[1]>=74)&&(pt=zt.match(/Chrome\/(\d+)/))&&(dt=pt[1]);var Zt,te=dt&&+dt,ee=!!Object.getOwnPropertySymbols&&!y((function(){return!Symbol.sham&&(Wt?38===te:te>37&&te<41)})),ne=ee&&!Symbol.sham&&"symbol"==typeof Symbol.iterator,re=Z("wks"),oe=v.Symbol,ie=ne?oe:oe&&oe.withoutSetter||nt,ae=function(t){return L(re,t)&&(ee||"string"==typeof re[t])||(ee&&L(oe,t)?re[t]=oe[t]:re[t]=ie("Symbol."+t)),re[t]},ce=ae("species"),le=function(t,e){var n;return Kt(t)&&("function"!=typeof(n=t.constructor)||n!==Array&&!Kt(n.prototype)?R(n)&&null===(n=n[ce])&&(n=void 0):n=void 0),new(void 0===n?Array:n)(0===e?0:e)},ue=[].push,fe=function(t){var e=1==t,n=2==t,r=3==t,o=4==t,i=6==t,a=7==t,c=5==t||i;return function(l,u,f,s){for(var p,d,h=Xt(l),g=j(h),v=function(t,e,n){if(qt(t),void 0===e)return t;switch(n){case 0:return function(){return t.call(e)};case 1:return function(n){return t.call(e,n)};case 2:return function(n,r){return t.call(e,n,r)};case 3:return function(n,r,o){return t.call(e,n,r,o)}}return function(){return t.apply(e,arguments)}}(u,f,3),y=St(g.length),b=0,x=s||le,m=e?x(l,y):n||a?x(l,0):void 0;y>b;b++)if((c||b in g)&&(d=v(p=g[b],b,h),t))if(e)m[b]=d;else if(d)switch(t){case 3:return!0;case 5:return p;case 6:return b;case 2:ue.call(m,p)}else switch(t){case 4:return!1;case 7:ue.call(m,p)}return i?-1:r||o?o:m}},se={forEach:fe(0),map:fe(1),filter:fe(2),some:fe(3),every:fe(4),find:fe(5),findIndex:fe(6),filterOut:fe(7)},pe=Object.keys||function(t){return Rt(t,Ct)},de=b?Object.defineProperties:function(t,e){F(t);for(var n,r=pe(e),o=r.length,i=0;o>i;)V.f(t,n=r[i++],e[n]);return t},he=bt("document","documentElement"),ge=ot("IE_PROTO"),ve=function(){},ye=function(t){return"<script>"+t+"</"+"script>"},be=function(){try{Zt=document.domain&&new ActiveXObject("htmlfile")}catch(t){}var t,e;be=Zt?function(t){t.write(ye("")),t.close();var e=t.parentWindow.Object;return t=null,e}(Zt):((e=_("iframe")).style.display="none",he.appendChild(e),e.src=String("javascript:"),(t=e.contentWindow.document).open(),t.write(ye("document.F=Object")),t.close(),t.F);for(var n=Ct.length;n--;)delete be.prototype[Ct[n]];return be()};it[ge]=!0;var xe=Object.create||function(t,e){var n;return null!==t?(ve.prototype=F(t),n=new ve,ve.prototype=null,n[ge]=t):n=be(),void 0===e?n:de(n,e)},me=ae("unscopables"),Ee=Array.prototype;null==Ee[me]&&V.f(Ee,me,{configurable:!0,value:xe(null)});var we,Se=se.find,Te="find",Oe=!0;Te in[]&&Array(1).find((function(){Oe=!1})),Ht({target:"Array",proto:!0,forced:Oe},{find:function(t){return Se(this,t,arguments.length>1?arguments[1]:void 0)}}),we=Te,Ee[me][we]=!0;var je=function(){var t=F(this),e="";return t.global&&(e+="g"),t.ignoreCase&&(e+="i"),t.multiline&&(e+="m"),t.dotAll&&(e+="s"),t.unicode&&(e+="u"),t.sticky&&(e+="y"),e};function Pe(t,e){return RegExp(t,e)}var Ae,Re,Ce={UNSUPPORTED_Y:y((function(){var t=Pe("a","y");return t.lastIndex=2,null!=t.exec("abcd")})),BROKEN_CARET:y((function(){var t=Pe("^r","gy");return t.lastIndex=2,null!=t.exec("str")}))},Ie=RegExp.prototype.exec,Le=String.prototype.replace,Me=Ie,De=(Ae=/a/,Re=/b*/g,Ie.call(Ae,"a"),Ie.call(Re,"a"),0!==Ae.lastIndex||0!==Re.lastIndex),_e=Ce.UNSUPPORTED_Y||Ce.BROKEN_CARET,$e=void 0!==/()??/.exec("")[1];(De||$e||_e)&&(Me=function(t){var e,n,r,o,i=this,a=_e&&i.sticky,c=je.call(i),l=i.source,u=0,f=t;return a&&(-1===(c=c.replace("y","")).indexOf("g")&&(c+="g"),f=String(t).slice(i.lastIndex),i.lastIndex>0&&(!i.multiline||i.multiline&&"\n"!==t[i.lastIndex-1])&&(l="(?: "+l+")",f=" "+f,u++),n=new RegExp("^(?:"+l+")",c)),$e&&(n=new RegExp("^"+l+"$(?!\\s)",c)),De&&(e=i.lastIndex),r=Ie.call(a?n:i,f),a?r?(r.input=r.input.slice(u),r[0]=r[0].slice(u),r.index=i.lastIndex,i.lastIndex+=r[0].length):i.lastIndex=0:De&&r&&(i.lastIndex=i.global?r.index+r[0].length:e),$e&&r&&r.length>1&&Le.call(r[0],n,(function(){for(o=1;o<arguments.length-2;o++)void 0===arguments[o]&&(r[o]=void 0)})),r});var ke=Me;Ht({target:"RegExp",proto:!0,forced:/./.exec!==ke},{exec:ke});var Ne=ae("species"),Fe=!y((function(){var t=/./;return t.exec=function(){var t=[];return t.groups={a:"7"},t},"7"!=="".replace(t,"$<a>")})),Be="$0"==="a".replace(/./,"$0"),Ve=ae("replace"),Ue=!!/./[Ve]&&""===/./[Ve]("a","$0"),Ge=!y((function(){var t=/(?:)/,e=t.exec;t.exec=function(){return e.apply(this,arguments)};var n="ab".split(t);return 2!==n.length||"a"!==n[0]||"b"!==n[1]})),He=function(t,e,n,r){var o=ae(t),i=!y((function(){var e={};return e[o]=function(){return 7},7!=""[t](e)})),a=i&&!y((function(){var e=!1,n=/a/;return"split"===t&&((n={}).constructor={},n.constructor[Ne]=function(){return n},n.flags="",n[o]=/./[o]),n.exec=function(){return e=!0,null},n[o](""),!e}));if(!i||!a||"replace"===t&&(!Fe||!Be||Ue)||"split"===t&&!Ge){var c=/./[o],l=n(o,""[t],(function(t,e,n,r,o){return e.exec===ke?i&&!o?{done:!0,value:c.call(e,n,r)}:{done:!0,value:t.call(n,e,r)}:{done:!1}}),{REPLACE_KEEPS_$0:Be,REGEXP_REPLACE_SUBSTITUTES_UNDEFINED_CAPTURE:Ue}),u=l[0],f=l[1];gt(String.prototype,t,u),gt(RegExp.prototype,o,2==e?function(t,e){return f.call(t,this,e)}:function(t){return f.call(t,this)})}r&&U(RegExp.prototype[o],"sham",!0)},qe=ae("match"),Xe=ae("species"),Ke=function(t){return function(e,n){var r,o,i=String(P(e)),a=Et(n),c=i.length;return a<0||a>=c?t?"":void 0:(r=i.charCodeAt(a))<55296||r>56319||a+1===c||(o=i.charCodeAt(a+1))<56320||o>57343?t?i.charAt(a):r:t?i.slice(a,a+2):o-56320+(r-55296<<10)+65536}},We={codeAt:Ke(!1),charAt:Ke(!0)}.charAt,ze=function(t,e,n){return e+(n?We(t,e).length:1)},Ye=function(t,e){var n=t.exec;if("function"==typeof n){var r=n.call(t,e);if("object"!=typeof r)throw TypeError("RegExp exec method returned something other than an Object or null");return r}if("RegExp"!==T(t))throw TypeError("RegExp#exec called on incompatible receiver");return ke.call(t,e)},Qe=[].push,Je=Math.min,Ze=4294967295,tn=!y((function(){return!RegExp(Ze,"y")}));He("split",2,(function(t,e,n){var r;return r="c"=="abbc".split(/(b)*/)[1]||4!="test".split(/(?:)/,-1).length||2!="ab".split(/(?:ab)*/).length||4!=".".split(/(.?)(.?)/).length||".".split(/()()/).length>1||"".split(/.?/).length?function(t,n){var r,o,i=String(P(this)),a=void 0===n?Ze:n>>>0;if(0===a)return[];if(void 0===t)return[i];if(!R(r=t)||!(void 0!==(o=r[qe])?o:"RegExp"==T(r)))return e.call(i,t,a);for(var c,l,u,f=[],s=(t.ignoreCase?"i":"")+(t.multiline?"m":"")+(t.unicode?"u":"")+(t.sticky?"y":""),p=0,d=new RegExp(t.source,s+"g");(c=ke.call(d,i))&&!((l=d.lastIndex)>p&&(f.push(i.slice(p,c.index)),c.length>1&&c.index<i.length&&Qe.apply(f,c.slice(1)),u=c[0].length,p=l,f.length>=a));)d.lastIndex===c.index&&d.lastIndex++;return p===i.length?!u&&d.test("")||f.push(""):f.push(i.slice(p)),f.length>a?f.slice(0,a):f}:"0".split(void 0,0).length?function(t,n){return void 0===t&&0===n?[]:e.call(this,t,n)}:e,[function(e,n){var o=P(this),i=null==e?void 0:e[t];return void 0!==i?i.call(e,o,n):r.call(String(o),e,n)},function(t,o){var i=n(r,t,this,o,r!==e);if(i.done)return i.value;var a=F(t),c=String(this),l=function(t,e){var n,r=F(t).constructor;return void 0===r||null==(n=F(r)[Xe])?e:qt(n)}(a,RegExp),u=a.unicode,f=(a.ignoreCase?"i":"")+(a.multiline?"m":"")+(a.unicode?"u":"")+(tn?"y":"g"),s=new l(tn?a:"^(?:"+a.source+")",f),p=void 0===o?Ze:o>>>0;if(0===p)return[];if(0===c.length)return null===Ye(s,c)?[c]:[];for(var d=0,h=0,g=[];h<c.length;){s.lastIndex=tn?h:0;var v,y=Ye(s,tn?c:c.slice(h));if(null===y||(v=Je(St(s.lastIndex+(tn?0:h)),c.length))===d)h=ze(c,h,u);else{if(g.push(c.slice(d,h)),g.length===p)return g;for(var b=1;b<=y.length-1;b++)if(g.push(y[b]),g.length===p)return g;h=d=v}}return g.push(c.slice(d)),g}]}),!tn);var en=Math.floor,nn="".replace,rn=/\$([$&'`]|\d{1,2}|<[^>]*>)/g,on=/\$([$&'`]|\d{1,2})/g,an=function(t,e,n,r,o,i){var a=n+t.length,c=r.length,l=on;return void 0!==o&&(o=Xt(o),l=rn),nn.call(i,l,(function(i,l){var u;switch(l.charAt(0)){case"$":return"$";case"&":return t;case"`":return e.slice(0,n);case"'":return e.slice(a);case"<":u=o[l.slice(1,-1)];break;default:var f=+l;if(0===f)return i;if(f>c){var s=en(f/10);return 0===s?i:s<=c?void 0===r[s-1]?l.charAt(1):r[s-1]+l.charAt(1):i}u=r[f-1]}return void 0===u?"":u}))},cn=Math.max,ln=Math.min;He("replace",2,(function(t,e,n,r){var o=r.REGEXP_REPLACE_SUBSTITUTES_UNDEFINED_CAPTURE,i=r.REPLACE_KEEPS_$0,a=o?"$":"$0";return[function(n,r){var o=P(this),i=null==n?void 0:n[t];return void 0!==i?i.call(n,o,r):e.call(String(o),n,r)},function(t,r){if(!o&&i||"string"==typeof r&&-1===r.indexOf(a)){var c=n(e,t,this,r);if(c.done)return c.value}var l=F(t),u=String(this),f="function"==typeof r;f||(r=String(r));var s=l.global;if(s){var p=l.unicode;l.lastIndex=0}for(var d=[];;){var h=Ye(l,u);if(null===h)break;if(d.push(h),!s)break;""===String(h[0])&&(l.lastIndex=ze(u,St(l.lastIndex),p))}for(var g,v="",y=0,b=0;b<d.length;b++){h=d[b];for(var x=String(h[0]),m=cn(ln(Et(h.index),u.length),0),E=[],w=1;w<h.length;w++)E.push(void 0===(g=h[w])?g:String(g));var S=h.groups;if(f){var T=[x].concat(E,m,u);void 0!==S&&T.push(S);var O=String(r.apply(void 0,T))}else O=an(x,u,m,E,S,r);m>=y&&(v+=u.slice(y,m)+O,y=m+x.length)}return v+u.slice(y)}]}));var un=function(t,e,n){var r=C(e);r in t?V.f(t,r,w(0,n)):t[r]=n},fn=ae("species"),sn=function(t){return te>=51||!y((function(){var e=[];return(e.constructor={})[fn]=function(){return{foo:1}},1!==e[t](Boolean).foo}))},pn=sn("slice"),dn=ae("species"),hn=[].slice,gn=Math.max;Ht({target:"Array",proto:!0,forced:!pn},{slice:function(t,e){var n,r,o,i=A(this),a=St(i.length),c=jt(t,a),l=jt(void 0===e?a:e,a);if(Kt(i)&&("function"!=typeof(n=i.constructor)||n!==Array&&!Kt(n.prototype)?R(n)&&null===(n=n[dn])&&(n=void 0):n=void 0,n===Array||void 0===n))return hn.call(i,c,l);for(r=new(void 0===n?Array:n)(gn(l-c,0)),o=0;c<l;c++,o++)c in i&&un(r,o,i[c]);return r.length=o,r}});var vn=se.map;Ht({target:"Array",proto:!0,forced:!sn("map")},{map:function(t){return vn(this,t,arguments.length>1?arguments[1]:void 0)}});var yn=Object.assign,bn=Object.defineProperty,xn=!yn||y((function(){if(b&&1!==yn({b:1},yn(bn({},"a",{enumerable:!0,get:function(){bn(this,"b",{value:3,enumerable:!1})}}),{b:2})).b)return!0;var t={},e={},n=Symbol(),r="abcdefghijklmnopqrst";return t[n]=7,r.split("").forEach((function(t){e[t]=t})),7!=yn({},t)[n]||pe(yn({},e)).join("")!=r}))?function(t,e){for(var n=Xt(t),r=arguments.length,o=1,i=Mt.f,a=E.f;r>o;)for(var c,l=j(arguments[o++]),u=i?pe(l).concat(i(l)):pe(l),f=u.length,s=0;f>s;)c=u[s++],b&&!a.call(l,c)||(n[c]=l[c]);return n}:yn;Ht({target:"Object",stat:!0,forced:Object.assign!==xn},{assign:xn});var mn=ae("isConcatSpreadable"),En=9007199254740991,wn="Maximum allowed index exceeded",Sn=te>=51||!y((function(){var t=[];return t[mn]=!1,t.concat()[0]!==t})),Tn=sn("concat"),On=function(t){if(!R(t))return!1;var e=t[mn];return void 0!==e?!!e:Kt(t)};Ht({target:"Array",proto:!0,forced:!Sn||!Tn},{concat:function(t){var e,n,r,o,i,a=Xt(this),c=le(a,0),l=0;for(e=-1,r=arguments.length;e<r;e++)if(On(i=-1===e?a:arguments[e])){if(l+(o=St(i.length))>En)throw TypeError(wn);for(n=0;n<o;n++,l++)n in i&&un(c,l,i[n])}else{if(l>=En)throw TypeError(wn);un(c,l++,i)}return c.length=l,c}});var jn=function(t,e){var n=[][t];return!!n&&y((function(){n.call(null,e||function(){throw 1},1)}))},Pn=[].join,An=j!=Object,Rn=jn("join",",");Ht({target:"Array",proto:!0,forced:An||!Rn},{join:function(t){return Pn.call(A(this),void 0===t?",":t)}});var Cn=se.forEach,In=jn("forEach")?[].forEach:function(t){return Cn(this,t,arguments.length>1?arguments[1]:void 0)};for(var Ln in{CSSRuleList:0,CSSStyleDeclaration:0,CSSValueList:0,ClientRectList:0,DOMRectList:0,DOMStringList:0,DOMTokenList:1,DataTransferItemList:0,FileList:0,HTMLAllCollection:0,HTMLCollection:0,HTMLFormElement:0,HTMLSelectElement:0,MediaList:0,MimeTypeArray:0,NamedNodeMap:0,NodeList:1,PaintRequestList:0,Plugin:0,PluginArray:0,SVGLengthList:0,SVGNumberList:0,SVGPathSegList:0,SVGPointList:0,SVGStringList:0,SVGTransformList:0,SourceBufferList:0,StyleSheetList:0,TextTrackCueList:0,TextTrackList:0,TouchList:0}){var Mn=v[Ln],Dn=Mn&&Mn.prototype;if(Dn&&Dn.forEach!==In)try{U(Dn,"forEach",In)}catch(t){Dn.forEach=In}}var _n=n.default.fn.bootstrapTable.utils,$n={json:"JSON",xml:"XML",png:"PNG",csv:"CSV",txt:"TXT",sql:"SQL",doc:"MS-Word",excel:"MS-Excel",xlsx:"MS-Excel (OpenXML)",powerpoint:"MS-Powerpoint",pdf:"PDF"};n.default.extend(n.default.fn.bootstrapTable.defaults,{showExport:!1,exportDataType:"basic",exportTypes:["json","xml","csv","txt","sql","excel"],exportOptions:{onCellHtmlData:function(t,e,n,r){return t.is("th")?t.find(".th-inner").text():r}},exportFooter:!1}),n.default.extend(n.default.fn.bootstrapTable.columnDefaults,{forceExport:!1,forceHide:!1}),n.default.extend(n.default.fn.bootstrapTable.defaults.icons,{export:{bootstrap3:"glyphicon-export icon-share",materialize:"file_download","bootstrap-table":"icon-download"}[n.default.fn.bootstrapTable.theme]||"fa-download"}),n.default.extend(n.default.fn.bootstrapTable.locales,{formatExport:function(){return"Export data"}}),n.default.extend(n.default.fn.bootstrapTable.defaults,n.default.fn.bootstrapTable.locales),n.default.fn.bootstrapTable.methods.push("exportTable"),n.default.extend(n.default.fn.bootstrapTable.defaults,{onExportSaved:function(t){return!1}}),n.default.extend(n.default.fn.bootstrapTable.Constructor.EVENTS,{"export-saved.bs.table":"onExportSaved"}),n.default.BootstrapTable=function(t){!function(t,e){if("function"!=typeof e&&null!==e)throw new TypeError("Super expression must either be null or a function");t.prototype=Object.create(e&&e.prototype,{constructor:{value:t,writable:!0,configurable:!0}}),e&&c(t,e)}(h,t);var e,l,s,d=u(h);function h(){return r(this,h),d.apply(this,arguments)}return e=h,(l=[{key:"initToolbar",value:function(){var t,e=this,r=this.options,o=r.exportTypes;if(this.showToolbar=this.showToolbar||r.showExport,this.options.showExport){if("string"==typeof o){var i=o.slice(1,-1).replace(/ /g,"").split(",");o=i.map((function(t){return t.slice(1,-1)}))}if(this.$export=this.$toolbar.find(">.columns div.export"),this.$export.length)return void this.updateExportButton();this.buttons=Object.assign(this.buttons,{export:{html:1===o.length?'\n            <div class="export '.concat(this.constants.classes.buttonsDropdown,'"\n            data-type="').concat(o[0],'">\n            <button class="').concat(this.constants.buttonsClass,'"\n            aria-label="Export"\n            type="button"\n            title="').concat(r.formatExport(),'">\n            ').concat(r.showButtonIcons?_n.sprintf(this.constants.html.icon,r.iconsPrefix,r.icons.export):"","\n            ").concat(r.showButtonText?r.formatExport():"","\n            </button>\n            </div>\n          "):'\n            <div class="export '.concat(this.constants.classes.buttonsDropdown,'">\n            <button class="').concat(this.constants.buttonsClass,' dropdown-toggle"\n            aria-label="Export"\n            ').concat(this.constants.dataToggle,'="dropdown"\n            type="button"\n            title="').concat(r.formatExport(),'">\n            ').concat(r.showButtonIcons?_n.sprintf(this.constants.html.icon,r.iconsPrefix,r.icons.export):"","\n            ").concat(r.showButtonText?r.formatExport():"","\n            ").concat(this.constants.html.dropdownCaret,"\n            </button>\n            </div>\n          ")}})}for(var c=arguments.length,l=new Array(c),u=0;u<c;u++)l[u]=arguments[u];if((t=f(a(h.prototype),"initToolbar",this)).call.apply(t,[this].concat(l)),this.$export=this.$toolbar.find(">.columns div.export"),this.options.showExport){var s=n.default(this.constants.html.toolbarDropdown.join("")),d=this.$export;if(o.length>1){this.$export.append(s),s.children().length&&(s=s.children().eq(0));var g,v=p(o);try{for(v.s();!(g=v.n()).done;){var y=g.value;if($n.hasOwnProperty(y)){var b=n.default(_n.sprintf(this.constants.html.pageDropdownItem,"",$n[y]));b.attr("data-type",y),s.append(b)}}}catch(t){v.e(t)}finally{v.f()}d=s.children()}this.updateExportButton(),d.click((function(t){t.preventDefault();var r={type:n.default(t.currentTarget).data("type"),escape:!1};e.exportTable(r)})),this.handleToolbar()}}},{key:"handleToolbar",value:function(){this.$export&&f(a(h.prototype),"handleToolbar",this)&&f(a(h.prototype),"handleToolbar",this).call(this)}},{key:"exportTable",value:function(t){var e=this,r=this.options,o=this.header.stateField,a=r.cardView,c=function(i){o&&e.hideColumn(o),a&&e.toggleView(),e.columns.forEach((function(t){t.forceHide&&e.hideColumn(t.field)}));var c=e.getData();if(r.detailView&&r.detailViewIcon){var l="left"===r.detailViewAlign?0:e.getVisibleFields().length+_n.getDetailViewIndexOffset(e.options);r.exportOptions.ignoreColumn=[l].concat(r.exportOptions.ignoreColumn||[])}if(r.exportFooter){var u=e.$tableFooter.find("tr").first(),f={},s=[];n.default.each(u.children(),(function(t,r){var o=n.default(r).children(".th-inner").first().html();f[e.columns[t].field]="&nbsp;"===o?null:o,s.push(o)})),e.$body.append(e.$body.children().last()[0].outerHTML);var p=e.$body.children().last();n.default.each(p.children(),(function(t,e){n.default(e).html(s[t])}))}var d=e.getHiddenColumns();d.forEach((function(t){t.forceExport&&e.showColumn(t.field)})),"function"==typeof r.exportOptions.fileName&&(t.fileName=r.exportOptions.fileName()),e.$el.tableExport(n.default.extend({onAfterSaveToFile:function(){r.exportFooter&&e.load(c),o&&e.showColumn(o),a&&e.toggleView(),d.forEach((function(t){t.forceExport&&e.hideColumn(t.field)})),e.columns.forEach((function(t){t.forceHide&&e.showColumn(t.field)})),i&&i()}},r.exportOptions,t))};if("all"===r.exportDataType&&r.pagination){var l="server"===r.sidePagination?"post-body.bs.table":"page-change.bs.table",u=this.options.virtualScroll;this.$el.one(l,(function(){setTimeout((function(){c((function(){e.options.virtualScroll=u,e.togglePagination()}))}),0)})),this.options.virtualScroll=!1,this.togglePagination(),this.trigger("export-saved",this.getData())}else if("selected"===r.exportDataType){var f=this.getData(),s=this.getSelections(),p=r.pagination;if(!s.length)return;"server"===r.sidePagination&&(f=i({total:r.totalRows},this.options.dataField,f),s=i({total:s.length},this.options.dataField,s)),this.load(s),p&&this.togglePagination(),c((function(){p&&e.togglePagination(),e.load(f)})),this.trigger("export-saved",s)}else c(),this.trigger("export-saved",this.getData(!0))}},{key:"updateSelected",value:function(){f(a(h.prototype),"updateSelected",this).call(this),this.updateExportButton()}},{key:"updateExportButton",value:function(){"selected"===this.options.exportDataType&&this.$export.find("> button").prop("disabled",!this.getSelections().length)}}])&&o(e.prototype,l),s&&o(e,s),h}(n.default.BootstrapTable)}));
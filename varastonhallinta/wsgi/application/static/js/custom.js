@@ -1,14 +1,48 @@
 // ----------------------------------------------------------------------------
 // export
 // ----------------------------------------------------------------------------
-$("table").bootstrapTable({
-    exportOptions: {
-        fileName: "näkymä"
-    },
-    exportTypes: ["csv", "json", "xml"],
-    formatExport: function () {
-        return "Vie näkymä"
+// The server streams the whole filtered and sorted view in the chosen format.
+function exportButtons() {
+    return {
+        btnExport: {
+            html: function () {
+                return '<div class="btn-group export" title="Vie näkymä">'
+                    + '<button class="btn btn-secondary dropdown-toggle" '
+                    + 'type="button" data-toggle="dropdown" '
+                    + 'aria-haspopup="true" aria-expanded="false">'
+                    + '<i class="fa fa-download"></i></button>'
+                    + '<div class="dropdown-menu dropdown-menu-right">'
+                    + ["csv", "jsonl", "xlsx"].map(format =>
+                        '<a class="dropdown-item" href="#" data-format="'
+                        + format + '">' + format.toUpperCase() + '</a>'
+                      ).join("")
+                    + '</div></div>'
+            }
+        }
+    }
+}
+
+$(document).on("click", ".export .dropdown-item", function (event) {
+    event.preventDefault()
+    var table = $(this).closest(".bootstrap-table")
+        .find("table[data-export-url]")
+    var options = table.bootstrapTable("getOptions")
+    var queryParams = typeof options.queryParams === "function"
+        ? options.queryParams : window[options.queryParams]
+    var params = {
+        search: options.searchText,
+        sort: options.sortName,
+        order: options.sortOrder
     }
+    if (queryParams) {
+        params = queryParams(params)
+    }
+    for (const key of ["cursor", "total", "total_token", "limit", "offset",
+                       "layout"]) {
+        delete params[key]  // the export covers every page
+    }
+    params.format = this.dataset.format
+    window.location = table.data("exportUrl") + "?" + $.param(params)
 })
 
 // ----------------------------------------------------------------------------
@@ -25,6 +59,7 @@ $("#advancedSearchSubmit").click(function () {
 })
 
 function queryParams(params) {
+    pagingParams(params)
     params.regex_search = document.getElementById("regex_search").value
     params.ignore_case = document.getElementById("ignore_case").checked
     params.numero = [
@@ -62,11 +97,63 @@ function queryParams(params) {
     return params
 }
 
+// ----------------------------------------------------------------------------
+// change log filter
+// ----------------------------------------------------------------------------
+$("#changelogFilter").submit(function (event) {
+    event.preventDefault()
+    $("#changelog_table").bootstrapTable("refresh", {pageNumber: 1})
+})
+
+function changelogQueryParams(params) {
+    pagingParams(params)
+    for (const name of ["alkupvm", "loppupvm", "tuote", "tilaus"]) {
+        const value = document.getElementById(name).value
+        if (value) {
+            params[name] = value
+        }
+    }
+    return params
+}
+
+// ----------------------------------------------------------------------------
+// server-side pagination
+// ----------------------------------------------------------------------------
+// The server only honours the continuation token when the request continues
+// from where the previous page ended, and the total only while the search
+// and the data stay unchanged, so both can always be sent.
+var paging = {}
+
+function pagingParams(params) {
+    params.layout = "columns"  // column names once instead of on every row
+    if (paging.cursor) {
+        params.cursor = paging.cursor
+    }
+    if (paging.total_token) {
+        params.total = paging.total
+        params.total_token = paging.total_token
+    }
+    return params
+}
+
+function pagingResponseHandler(res) {
+    paging = {
+        cursor: res.cursor,
+        total: res.total,
+        total_token: res.total_token
+    }
+    if (res.columns) {
+        res.rows = res.rows.map(values => Object.fromEntries(
+            res.columns.map((column, i) => [column, values[i]])))
+    }
+    return res
+}
+
 // ----------------------------------------------------------------------------
 // bootstrap-table custom buttons
 // ----------------------------------------------------------------------------
 function buttons () {
-    return {
+    return Object.assign({
         btnAdvancedSearch: {
             text: "Tarkennettu haku",
             icon: "fa-search-plus",
@@ -77,7 +164,7 @@ function buttons () {
                 "data-target": "#advancedSearch"
             }
         }
-    }
+    }, exportButtons())
 }
 
 // ----------------------------------------------------------------------------
@@ -136,6 +223,62 @@ $(".selectpicker").selectpicker({
     styleBase: "form-control"
 });
 
+// ----------------------------------------------------------------------------
+// order picker
+// ----------------------------------------------------------------------------
+// Orders are searched on the server as the user types, so the product form
+// only has to render the order that is already chosen.
+function orderLabel(tilaus) {
+    var details = [tilaus.nimi, tilaus.toimituspvm].filter(x => x).join(", ")
+    return "#" + tilaus.id + (details ? " (" + details + ")" : "")
+}
+
+$("#tilausselect").each(function () {
+    var select = $(this)
+    var searchbox = select.parent().find(".bs-searchbox input")
+    var group = select.find("optgroup.tilaukset")
+    var timer = null
+    var latest = 0
+
+    function load(text) {
+        var request = ++latest
+        $.getJSON(select.data("lookupUrl"), {q: text}, function (res) {
+            if (request !== latest) {
+                return  // a newer search has been started
+            }
+            var chosen = group.find("option:selected").val()
+            group.find("option:not(:selected)").remove()
+            for (const tilaus of res.rows) {
+                if (String(tilaus.id) !== chosen) {
+                    group.append($("<option>", {
+                        value: tilaus.id,
+                        text: orderLabel(tilaus),
+                        "data-tokens": [tilaus.puhelinnumero,
+                                        tilaus.varausnumero].join(" ")
+                    }))
+                }
+            }
+            if (res.more) {
+                group.append($("<option>", {
+                    disabled: true,
+                    text: "Tarkenna hakua nähdäksesi lisää tilauksia..."
+                }))
+            }
+            select.selectpicker("refresh")
+            searchbox.trigger("propertychange")  // reapply the filter
+        })
+    }
+
+    select.one("show.bs.select", function () {
+        load("")
+    })
+    searchbox.on("input", function () {
+        var text = this.value
+        clearTimeout(timer)
+        timer = setTimeout(function () { load(text) }, 250)
+    })
+})
+
 // ----------------------------------------------------------------------------
 // keyboard shortcuts
 // ----------------------------------------------------------------------------
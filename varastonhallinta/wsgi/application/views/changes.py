@@ -0,0 +1,75 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Routes related to the change log."""
+
+import logging
+from flask import render_template, request
+from wsgi.application.flask_app import app, get_db_connection
+from wsgi.application.responses import conditional, listing_response
+from wsgi.application.search import SearchHelper
+
+logger = logging.getLogger(__name__)
+
+@app.route("/changelog_json")
+@conditional
+def changelog_json():
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
+    conn = get_db_connection()
+    query = SearchHelper()
+    query.append(
+        """
+        SELECT
+          id,
+          aikaleima,
+          taulu,
+          toiminto,
+          rivi_id,
+          parametrit,
+          komento,
+          id AS sort_key
+        """)
+    query.append_from(
+        f"""
+        FROM
+          {conn.changelog.schema}.Muutosloki
+        """)
+
+    # Timestamps are ISO 8601 strings, so dates compare as their prefixes.
+    alkupvm = request.args.get("alkupvm")
+    loppupvm = request.args.get("loppupvm")
+    if alkupvm:
+        query.add_condition("aikaleima >= ?", [alkupvm])
+    if loppupvm:
+        query.add_condition("aikaleima < date(?, '+1 day')", [loppupvm])
+    rows_of = []
+    for table, parameter in (("Tuotteet", "tuote"), ("Tilaukset", "tilaus")):
+        row_id = request.args.get(parameter, type=int)
+        if row_id is not None:
+            rows_of.append(f"(taulu = '{table}' AND rivi_id = ?)")
+            query.parameters.append(row_id)
+    if rows_of:
+        query.add_condition("(" + " OR ".join(rows_of) + ")")
+
+    seek_offset = query.seek("id", "id", True, request.args.get("cursor"),
+                             offset)
+    query.append_where_clause()
+    query.append(
+        """
+        ORDER BY id DESC
+        LIMIT ?
+        OFFSET ?
+        """,
+        [-1 if limit is None else limit, seek_offset])
+    rows = query.execute(conn)
+    total, total_token = query.total(conn,
+                                     request.args.get("total", type=int),
+                                     request.args.get("total_token"))
+    return listing_response(rows, total=total, total_token=total_token,
+                            cursor=query.cursor(rows, offset, limit))
+
+@app.route("/changelog_index")
+def changelog_index():
+    return render_template("changelog/index.html")
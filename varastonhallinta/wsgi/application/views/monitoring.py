@@ -0,0 +1,95 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Routes related to monitoring."""
+
+import ipaddress
+import logging
+import time
+from functools import partial
+from flask import Response, abort, g, request
+from wsgi.application import backups, lookups, metrics, search
+from wsgi.application.flask_app import app, get_pool, get_writer
+
+logger = logging.getLogger(__name__)
+
+CACHES = (search.row_counts, lookups.reference_data, lookups.open_orders)
+
+@app.before_request
+def start_timer():
+    metrics.start_request()
+    g._started = time.perf_counter()
+
+@app.after_request
+def record_request(response):
+    started = getattr(g, "_started", None)
+    if started is None:
+        return response
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    finish = partial(metrics.finish_request, route, request.method,
+                     response.status_code)
+    if response.is_streamed:
+        # Streamed bodies run their queries as they are sent, in the same
+        # thread, so they are recorded once the server closes them.
+        response.call_on_close(
+            lambda: finish(time.perf_counter() - started))
+    else:
+        finish(time.perf_counter() - started)
+    return response
+
+def is_local(address) -> bool:
+    """Tell whether a request comes from this machine."""
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return True  # Unix socket peers have no IP address.
+    mapped = getattr(address, "ipv4_mapped", None)
+    return (mapped or address).is_loopback
+
+def collect() -> list:
+    """Return the state of the pool, writer, caches and backups."""
+    pool, writer = get_pool(), get_writer()
+    collected = [
+        ("varastonhallinta_pool_connections", "gauge",
+         "Open pooled connections.", [({}, pool.size)]),
+        ("varastonhallinta_pool_requests_total", "counter",
+         "Pooled connection requests by result.",
+         [({"result": "hit"}, pool.hits), ({"result": "miss"}, pool.misses)]),
+        ("varastonhallinta_writer_queue_depth", "gauge",
+         "Write jobs waiting for the writer.", [({}, writer.queue_depth)]),
+        ("varastonhallinta_writer_batches_total", "counter",
+         "Transactions committed by the writer.", [({}, writer.batches)]),
+        ("varastonhallinta_writer_jobs_total", "counter",
+         "Write jobs run by the writer.", [({}, writer.jobs)]),
+        ("varastonhallinta_writer_largest_batch", "gauge",
+         "Most write jobs committed in one transaction.",
+         [({}, writer.largest_batch_size)]),
+        ("varastonhallinta_cache_requests_total", "counter",
+         "Cache lookups by cache and result.",
+         [({"cache": cache.name, "result": result}, count)
+          for cache in CACHES
+          for result, count in (("hit", cache.hits),
+                                ("miss", cache.misses))]),
+    ]
+    backup = backups.last_backup()
+    if backup is not None:
+        collected += [
+            ("varastonhallinta_backup_duration_seconds", "gauge",
+             "Duration of the latest scheduled backup.",
+             [({}, backup.seconds)]),
+            ("varastonhallinta_backup_size_bytes", "gauge",
+             "Size of the latest scheduled backup.", [({}, backup.size)]),
+        ]
+    return collected
+
+@app.route("/metrics")
+def metrics_text():
+    """Serve metrics of this process to local scrapers only.
+
+    With several worker processes, each scrape reaches one of them.
+    """
+    if not is_local(request.remote_addr):
+        abort(404)
+    return Response(metrics.exposition(collect()),
+                    content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -8,11 +8,45 @@ import logging
 import sqlite3
 from flask import (render_template, request, url_for, flash, redirect, jsonify,
                    abort)
-from wsgi.application.flask_app import app, get_db_connection
+from wsgi.application import lookups
+from wsgi.application.export import export_response
+from wsgi.application.flask_app import app, get_db_connection, get_writer
+from wsgi.application.responses import conditional, listing_response
 from wsgi.application.search import SearchHelper
 
 logger = logging.getLogger(__name__)
 
+# Product summary of an order, computed only for the rows it is selected for.
+PRODUCTS = """(SELECT GROUP_CONCAT(Tuotteet.kuvaus, ', ') FROM Tuotteet
+              WHERE Tuotteet.tilaus_id = Tilaukset.id)"""
+
+# Numeric expressions go without COLLATE so that indexes can serve them.
+SORT_COLUMNS = {"id": "Tilaukset.id",
+                "toimituspvm": "Tilaukset.toimituspvm COLLATE NOCASE",
+                "toimitustapa": "Toimitustavat.kuvaus COLLATE NOCASE",
+                "varausnumero": "Tilaukset.varausnumero",
+                "asiakas": "Asiakkaat.nimi COLLATE NOCASE",
+                "asiakkaan_puhelinnumero":
+                    "Asiakkaat.puhelinnumero COLLATE NOCASE",
+                "asiakkaan_osoite": "Asiakkaat.osoite COLLATE NOCASE",
+                "tuotteet": f"{PRODUCTS} COLLATE NOCASE",
+                "lisätiedot": "Tilaukset.lisätiedot COLLATE NOCASE"}
+
+COLUMNS = f"""
+          Tilaukset.id,
+          Tilaukset.toimituspvm,
+          Tilaukset.varausnumero,
+          Tilaukset.lisätiedot,
+          Tilaukset.arkistoitu,
+          Toimitustavat.kuvaus AS toimitustapa,
+          Asiakkaat.nimi AS asiakas,
+          Asiakkaat.puhelinnumero AS asiakkaan_puhelinnumero,
+          Asiakkaat.osoite AS asiakkaan_osoite,
+          Asiakkaat.lisätiedot AS asiakkaan_lisätiedot,
+          {PRODUCTS} AS tuotteet"""
+
+LOOKUP_FIELDS = ("numero", "nimi", "puhelinnumero", "varausnumero")
+
 def get_order(order_id) -> sqlite3.Row:
     """Get order and client by given id."""
     conn = get_db_connection()
@@ -41,41 +75,118 @@ def get_order(order_id) -> sqlite3.Row:
         abort(404)
     return order
 
-def order_form_submit(conn, commands: list, order_id=None):
+def order_form_submit(commands: list, order_id=None):
     nimi = request.form["nimi"] or None
     puhelinnumero = request.form["puhelinnumero"] or None
     osoite = request.form["osoite"] or None
-    args = [nimi, puhelinnumero, osoite]
-    if order_id is not None:
-        args.append(order_id)
     if not nimi:
         flash("Asiakkaan nimi on pakollinen.", "alert-danger")
         return None
-    else:
-        cursor = conn.cursor()
-        cursor.execute(commands[0], args)
-        conn.commit()
-        asiakas_id = cursor.lastrowid
-
     toimitustapa_id = request.form["toimitustapa_id"] or None
     toimituspvm = request.form["toimituspvm"] or None
     varausnumero = request.form["varausnumero"] or None
     lisätiedot = request.form["lisätiedot"] or None
-    if order_id is None:
-        args = [asiakas_id, toimitustapa_id, toimituspvm, varausnumero,
-                lisätiedot]
-    else:
-        args = [toimitustapa_id, toimituspvm, varausnumero, lisätiedot,
-                order_id]
-    conn.execute(commands[1], args)
-    conn.commit()
+
+    def save(conn):
+        args = [nimi, puhelinnumero, osoite]
+        if order_id is not None:
+            args.append(order_id)
+        asiakas_id = conn.execute(commands[0], args).lastrowid
+        if order_id is None:
+            args = [asiakas_id, toimitustapa_id, toimituspvm, varausnumero,
+                    lisätiedot]
+        else:
+            args = [toimitustapa_id, toimituspvm, varausnumero, lisätiedot,
+                    order_id]
+        conn.execute(commands[1], args)
+
+    get_writer().run(save)
     return redirect(url_for("order_index"))
 
+def search_orders(select) -> SearchHelper:
+    """Build order query with the search conditions of the request."""
+    query = SearchHelper()
+    query.append(select)
+    query.append_from(
+        """
+        FROM
+          Tilaukset LEFT JOIN Toimitustavat ON
+                              Tilaukset.toimitustapa_id = Toimitustavat.id
+                    LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id
+        """)
+    query.add_condition("Tilaukset.arkistoitu = 0")
+    return query
+
 @app.route("/orders_json")
+@conditional
 def orders_json():
-    search = request.args.get("search")
-    order = request.args.get("order") or "DESC"
-    sort = request.args.get("sort") or "Tilaukset.id"
+    order = "ASC" if request.args.get("order") == "asc" else "DESC"
+    sort = SORT_COLUMNS.get(request.args.get("sort"), "Tilaukset.id")
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
+
+    # Select the page of order ids first, so that products are only
+    # summarized for the orders on the page.
+    query = search_orders(
+        f"""
+        WITH Sivu AS (
+        SELECT
+          Tilaukset.id,
+          {sort} AS sort_key
+        """)
+    seek_offset = offset
+    if sort != SORT_COLUMNS["tuotteet"]:  # seeking would summarize again
+        seek_offset = query.seek(sort, "Tilaukset.id", order == "DESC",
+                                 request.args.get("cursor"), offset)
+    query.append_where_clause()
+    query.append(
+        f"""
+        ORDER BY {sort} {order}, Tilaukset.id {order}
+        LIMIT ?
+        OFFSET ?)
+        SELECT
+          {COLUMNS},
+          Sivu.sort_key
+        FROM
+          Sivu JOIN Tilaukset ON Sivu.id = Tilaukset.id
+               LEFT JOIN Toimitustavat ON
+                         Tilaukset.toimitustapa_id = Toimitustavat.id
+               LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id
+        ORDER BY Sivu.sort_key {order}, Sivu.id {order}
+        """,
+        [-1 if limit is None else limit, seek_offset])
+    conn = get_db_connection()
+    rows = query.execute(conn)
+    total, total_token = query.total(conn,
+                                     request.args.get("total", type=int),
+                                     request.args.get("total_token"))
+    return listing_response(rows, total=total, total_token=total_token,
+                            cursor=query.cursor(rows, offset, limit))
+
+@app.route("/orders_export")
+def orders_export():
+    order = "ASC" if request.args.get("order") == "asc" else "DESC"
+    sort = SORT_COLUMNS.get(request.args.get("sort"), "Tilaukset.id")
+    query = search_orders(
+        f"""
+        SELECT
+          {COLUMNS},
+          {sort} AS sort_key
+        """)
+    query.append_where_clause()
+    query.append(
+        f"""
+        ORDER BY {sort} {order}, Tilaukset.id {order}
+        """)
+    return export_response(get_db_connection(), query,
+                           request.args.get("format"), "tilaukset")
+
+@app.route("/orders_lookup")
+def orders_lookup():
+    """Return open orders matching a typeahead query, newest first."""
+    text = request.args.get("q", "").strip().lstrip("#")
+    limit = min(request.args.get("limit", 20, type=int), 100)
+    offset = request.args.get("offset", 0, type=int)
     query = SearchHelper()
     query.append(
         """
@@ -83,37 +194,35 @@ def orders_json():
           Tilaukset.id,
           Tilaukset.toimituspvm,
           Tilaukset.varausnumero,
-          Tilaukset.lisätiedot,
-          Tilaukset.arkistoitu,
-          Toimitustavat.kuvaus AS toimitustapa,
-          Asiakkaat.nimi AS asiakas,
-          Asiakkaat.puhelinnumero AS asiakkaan_puhelinnumero,
-          Asiakkaat.osoite AS asiakkaan_osoite,
-          Asiakkaat.lisätiedot AS asiakkaan_lisätiedot,
-          GROUP_CONCAT(Tuotteet.kuvaus, ', ') AS tuotteet,
-          COUNT(*) OVER() AS total
+          Asiakkaat.nimi,
+          Asiakkaat.puhelinnumero
+        """)
+    query.append_from(
+        """
         FROM
-          Tilaukset LEFT JOIN Toimitustavat ON
-                              Tilaukset.toimitustapa_id = Toimitustavat.id
-                    LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id
-                    LEFT JOIN Tuotteet ON Tilaukset.id = Tuotteet.tilaus_id
+          Tilaukset LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id
         """)
-    query.add_range("Tilaukset.arkistoitu", "0", "0")
+    query.add_condition("Tilaukset.arkistoitu = 0")
+    if len(text) >= 3:
+        query.set_fulltext("Tilaukset.id", "Tilaushaku", LOOKUP_FIELDS, text)
+    elif text.isdecimal():
+        # Short input is most likely an order number. Other short input
+        # would need a scan, so the newest orders are returned for the
+        # picker to filter instead.
+        query.add_condition("Tilaukset.id = ?", [int(text)])
     query.append_where_clause()
     query.append(
-        f"""
-        GROUP BY
-          Tilaukset.id
-        ORDER BY {sort} COLLATE NOCASE {order}
+        """
+        ORDER BY Tilaukset.id DESC
         LIMIT ?
         OFFSET ?
         """,
-        [request.args.get("limit"), request.args.get("offset")])
-    rows = query.execute(get_db_connection())
-    return jsonify(
-        {"total": rows and rows[0]["total"] or 0,
-         "rows": [{k:v for k, v in dict(row).items() if k != "total"}
-                  for row in rows]})
+        [limit + 1, offset])  # one extra row tells if there are more
+    conn = get_db_connection()
+    rows = lookups.open_orders.get(
+        conn, (text, limit, offset),
+        lambda: [dict(row) for row in query.execute(conn)])
+    return jsonify({"rows": rows[:limit], "more": len(rows) > limit})
 
 @app.route("/order_index")
 def order_index():
@@ -139,12 +248,12 @@ def order_create():
                                  lisätiedot)
                     VALUES (?, ?, ?, ?, ?)
                     """]
-        redirect_url = order_form_submit(conn, commands)
+        redirect_url = order_form_submit(commands)
         if redirect_url:
             flash("Lisättiin tilaus.", "alert-success")
             return redirect_url
 
-    toimitustavat = conn.execute("SELECT * FROM Toimitustavat").fetchall()
+    toimitustavat = lookups.toimitustavat(conn)
     return render_template("orders/create.html", toimitustavat=toimitustavat)
 
 @app.route("/<int:order_id>/order_edit", methods=("GET", "POST"))
@@ -173,32 +282,28 @@ def order_edit(order_id):
                     WHERE
                       id = ?
                     """]
-        redirect_url = order_form_submit(conn, commands, order_id)
+        redirect_url = order_form_submit(commands, order_id)
         if redirect_url:
             flash(f"Muokattiin tilausta #{order_id}.", "alert-success")
             return redirect_url
 
     order = get_order(order_id)
-    toimitustavat = conn.execute("SELECT * FROM Toimitustavat").fetchall()
+    toimitustavat = lookups.toimitustavat(conn)
     return render_template("orders/edit.html", order=order,
                            toimitustavat=toimitustavat)
 
 @app.route("/<int:order_id>/order_archive", methods=("POST",))
 def order_archive(order_id):
     order = get_order(order_id)
-    conn = get_db_connection()
-    conn.execute("UPDATE tilaukset SET arkistoitu = ? WHERE id = ?",
-                 (1, order_id))
-    conn.commit()
+    get_writer().execute("UPDATE tilaukset SET arkistoitu = ? WHERE id = ?",
+                         (1, order_id))
     flash(f"Arkistoitiin tilaus #{order_id}.", "alert-warning")
     return redirect(url_for("order_index"))
 
 @app.route("/<int:order_id>/order_unarchive", methods=("POST",))
 def order_unarchive(order_id):
     order = get_order(order_id)
-    conn = get_db_connection()
-    conn.execute("UPDATE tilaukset SET arkistoitu = ? WHERE id = ?",
-                 (0, order_id))
-    conn.commit()
+    get_writer().execute("UPDATE tilaukset SET arkistoitu = ? WHERE id = ?",
+                         (0, order_id))
     flash(f"Palautettiin tilaus #{order_id} arkistosta.", "alert-warning")
     return redirect(url_for("order_index"))
@@ -8,21 +8,58 @@ import logging
 import sqlite3
 from flask import (render_template, request, url_for, flash, redirect, jsonify,
                    abort)
-from wsgi.application.flask_app import app, get_db_connection
+from wsgi.application import lookups
+from wsgi.application.export import export_response
+from wsgi.application.flask_app import app, get_db_connection, get_writer
+from wsgi.application.responses import conditional, listing_response
 from wsgi.application.search import SearchHelper
 
 logger = logging.getLogger(__name__)
 
+FULLTEXT_FIELDS = ("saapumispvm", "kuvaus", "hinta", "koodi", "sijainti",
+                   "tila", "toimitustapa", "toimituspvm", "varausnumero",
+                   "lisätiedot")
+
+# Numeric expressions go without COLLATE so that indexes can serve them.
+SORT_COLUMNS = {"id": "T.id",
+                "saapumispvm": "T.saapumispvm COLLATE NOCASE",
+                "kuvaus": "T.kuvaus COLLATE NOCASE",
+                "hinta": "T.hinta_luku",
+                "koodi": "T.koodi_luku",
+                "sijainti": "Sijainnit.kuvaus COLLATE NOCASE",
+                "tila": "Tilat.kuvaus COLLATE NOCASE",
+                "varausnumero": "Tilaukset.varausnumero",
+                "toimitustapa": "Toimitustavat.kuvaus COLLATE NOCASE",
+                "toimituspvm": "Tilaukset.toimituspvm COLLATE NOCASE",
+                "lisätiedot": "T.lisätiedot COLLATE NOCASE"}
+
+# Stored columns of Tuotteet, without the generated hinta_luku and koodi_luku.
+PRODUCT_COLUMNS = ("id, saapumispvm, kuvaus, hinta, koodi, sijainti_id, "
+                   "tila_id, lisätiedot, tilaus_id, arkistoitu")
+
 def get_product(product_id) -> sqlite3.Row:
     """Get product by given id."""
     conn = get_db_connection()
-    product = conn.execute("SELECT * FROM tuotteet WHERE id = ?",
-                           (product_id,)).fetchone()
+    product = conn.execute(
+        f"SELECT {PRODUCT_COLUMNS} FROM tuotteet WHERE id = ?",
+        (product_id,)).fetchone()
     if product is None:
         abort(404)
     return product
 
-def product_form_submit(conn, command, product_id=None):
+def get_chosen_order(conn, product=None) -> list:
+    """Get the order chosen in the form, the rest are fetched on demand."""
+    tilaus_id = request.form.get("tilaus_id") or (product
+                                                  and product["tilaus_id"])
+    if not tilaus_id or str(tilaus_id) == "-1":
+        return []
+    return conn.execute(
+        "SELECT Tilaukset.id, Tilaukset.toimituspvm, Asiakkaat.nimi "
+        "FROM Tilaukset LEFT JOIN Asiakkaat ON "
+        "Tilaukset.asiakas_id = Asiakkaat.id WHERE Tilaukset.id = ?",
+        (tilaus_id,)).fetchall()
+
+def product_form_submit(command, product_id=None):
     saapumispvm = request.form["saapumispvm"] or None  # "" or None => None
     kuvaus = request.form["kuvaus"]
     hinta = request.form["hinta"] or None
@@ -34,47 +71,43 @@ def product_form_submit(conn, command, product_id=None):
     uusi_tilaus = tilaus_id == "-1"
     if not kuvaus:
         flash("Kuvaus on pakollinen.", "alert-danger")
-    else:
+        return None
+
+    def save(conn):
+        order_id = tilaus_id
         if uusi_tilaus:
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO asiakkaat DEFAULT VALUES")
-            conn.commit()
-            asiakas_id = cursor.lastrowid
-            cursor.execute("INSERT INTO Tilaukset (asiakas_id) VALUES (?)",
-                           (asiakas_id,))
-            tilaus_id = cursor.lastrowid
-            conn.commit()
-            flash(f"Lisättiin tilaus #{tilaus_id}.", "alert-success")
+            asiakas_id = conn.execute(
+                "INSERT INTO asiakkaat DEFAULT VALUES").lastrowid
+            order_id = conn.execute(
+                "INSERT INTO Tilaukset (asiakas_id) VALUES (?)",
+                (asiakas_id,)).lastrowid
         args = [saapumispvm, kuvaus, hinta, koodi, sijainti_id, tila_id,
-                lisätiedot, tilaus_id]
+                lisätiedot, order_id]
         if product_id is not None:
             args.append(product_id)
         conn.execute(command, args)
-        conn.commit()
-        if uusi_tilaus:
-            return redirect(url_for("order_edit", order_id=tilaus_id))
-        return redirect(url_for("index"))
-    return None
+        return order_id
+
+    tilaus_id = get_writer().run(save)
+    if uusi_tilaus:
+        flash(f"Lisättiin tilaus #{tilaus_id}.", "alert-success")
+        return redirect(url_for("order_edit", order_id=tilaus_id))
+    return redirect(url_for("index"))
 
 @app.route("/")
 def index():
-    return render_template("products/index.html")
+    conn = get_db_connection()
+    return render_template("products/index.html",
+                           tilat=lookups.tilat(conn),
+                           sijainnit=lookups.sijainnit(conn),
+                           toimitustavat=lookups.toimitustavat(conn))
 
-@app.route("/products_json")
-def products_json():
+def search_products(conn, sort) -> SearchHelper:
+    """Build product query with the search conditions of the request."""
     search = request.args.get("search")
-    order = request.args.get("order") or "DESC"
-    sort = request.args.get("sort") or "id"
-    if sort in {"id", "saapumispvm", "kuvaus", "lisätiedot"}:
-        sort = "T." + sort
-    elif sort == "koodi":
-        sort = "CAST(T.koodi AS INTEGER)"
-    elif sort == "hinta":
-        sort = "CAST(REPLACE(T.hinta, ',', '.') AS REAL)"
-
     query = SearchHelper()
     query.append(
-        """
+        f"""
         SELECT
           T.id,
           T.saapumispvm,
@@ -88,7 +121,10 @@ def products_json():
           Tilaukset.varausnumero AS varausnumero,
           T.arkistoitu,
           T.lisätiedot,
-          COUNT(*) OVER() AS total
+          {sort} AS sort_key
+        """)
+    query.append_from(
+        """
         FROM
           Tuotteet T LEFT JOIN Sijainnit ON T.sijainti_id = Sijainnit.id
                      LEFT JOIN Tilat ON T.tila_id = Tilat.id
@@ -97,62 +133,94 @@ def products_json():
                                Tilaukset.toimitustapa_id = Toimitustavat.id
                      LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id = Asiakkaat.id
         """)
-    regex_data = ("""
-                  (REG(IFNULL(T.saapumispvm, '-'))
-                  OR REG(IFNULL(T.kuvaus, '-'))
-                  OR REG(IFNULL(T.hinta, '-'))
-                  OR REG(IFNULL(T.koodi, '-'))
-                  OR REG(IFNULL(sijainti, '-'))
-                  OR REG(tila)
-                  OR REG(IFNULL(toimitustapa, '-'))
-                  OR REG(IFNULL(toimituspvm, '-'))
-                  OR REG(IFNULL(CAST(varausnumero AS TEXT), '-'))
-                  OR REG(IFNULL(T.lisätiedot, '-')))
-                  """)
+    regex_fields = ("IFNULL(T.saapumispvm, '-')",
+                    "IFNULL(T.kuvaus, '-')",
+                    "IFNULL(T.hinta, '-')",
+                    "IFNULL(T.koodi, '-')",
+                    "IFNULL(Sijainnit.kuvaus, '-')",
+                    "Tilat.kuvaus",
+                    "IFNULL(Toimitustavat.kuvaus, '-')",
+                    "IFNULL(Tilaukset.toimituspvm, '-')",
+                    "IFNULL(CAST(Tilaukset.varausnumero AS TEXT), '-')",
+                    "IFNULL(T.lisätiedot, '-')")
     if search == "(tarkennettu haku)":
-        query.add_range("CAST(T.koodi AS INTEGER)",
+        query.add_range("T.koodi_luku",
                         *request.args.get("numero").split(","))
         query.add_range("T.saapumispvm",
                         *request.args.get("saapumispvm").split(","))
-        query.add_range("toimituspvm",
+        query.add_range("Tilaukset.toimituspvm",
                         *request.args.get("toimituspvm").split(","))
-        query.add_range("varausnumero",
+        query.add_range("Tilaukset.varausnumero",
                         *request.args.get("varausnumero").split(","))
-        query.add_range("CAST(REPLACE(T.hinta, ',', '.') AS REAL)",
+        query.add_range("T.hinta_luku",
                         *request.args.get("hinta").split(","))
-        query.add_multiselect("sijainti", request.args.get("sijainti"), 3)
-        query.add_multiselect("tila", request.args.get("tila"), 3)
-        query.add_multiselect("toimitustapa",
+        # Nullable columns have "-" as an extra option.
+        query.add_multiselect("Sijainnit.kuvaus",
+                              request.args.get("sijainti"),
+                              len(lookups.sijainnit(conn)) + 1)
+        query.add_multiselect("Tilat.kuvaus", request.args.get("tila"),
+                              len(lookups.tilat(conn)))
+        query.add_multiselect("Toimitustavat.kuvaus",
                               request.args.get("toimitustapa"),
-                              3)
+                              len(lookups.toimitustavat(conn)) + 1)
         query.add_multiselect("T.arkistoitu",
                               request.args.get("arkistoitu"),
                               2)
         regex_search = request.args.get("regex_search")
         if regex_search:
-            query.set_regex(regex_data,
+            query.set_regex(regex_fields,
                             regex_search,
                             request.args.get("ignore_case") == 'true')
     elif search:
-        query.add_range("T.arkistoitu", "0", "0")
-        query.set_regex(regex_data, search, True)
+        query.add_condition("T.arkistoitu = 0")
+        query.set_fulltext("T.id", "Tuotehaku", FULLTEXT_FIELDS, search)
     else:
-        query.add_range("T.arkistoitu", "0", "0")
+        query.add_condition("T.arkistoitu = 0")
+    return query
+
+@app.route("/products_json")
+@conditional
+def products_json():
+    order = "ASC" if request.args.get("order") == "asc" else "DESC"
+    sort = SORT_COLUMNS.get(request.args.get("sort"), "T.id")
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
+    conn = get_db_connection()
+    query = search_products(conn, sort)
     if query.no_results:
-        return jsonify({"total": 0, "rows": []})
+        return listing_response([], total=0)
+    seek_offset = query.seek(sort, "T.id", order == "DESC",
+                             request.args.get("cursor"), offset)
     query.append_where_clause()
     query.append(
         f"""
-        ORDER BY {sort} COLLATE NOCASE {order}
+        ORDER BY {sort} {order}, T.id {order}
         LIMIT ?
         OFFSET ?
         """,
-        [request.args.get("limit"), request.args.get("offset")])
-    rows = query.execute(get_db_connection())
-    return jsonify(
-        {"total": rows and rows[0]["total"] or 0,
-         "rows": [{k:v for k, v in dict(row).items() if k != "total"}
-                  for row in rows]})
+        [-1 if limit is None else limit, seek_offset])
+    rows = query.execute(conn)
+    total, total_token = query.total(conn,
+                                     request.args.get("total", type=int),
+                                     request.args.get("total_token"))
+    return listing_response(rows, total=total, total_token=total_token,
+                            cursor=query.cursor(rows, offset, limit))
+
+@app.route("/products_export")
+def products_export():
+    order = "ASC" if request.args.get("order") == "asc" else "DESC"
+    sort = SORT_COLUMNS.get(request.args.get("sort"), "T.id")
+    conn = get_db_connection()
+    query = search_products(conn, sort)
+    if query.no_results:
+        query.add_condition("0")
+    query.append_where_clause()
+    query.append(
+        f"""
+        ORDER BY {sort} {order}, T.id {order}
+        """)
+    return export_response(conn, query, request.args.get("format"),
+                           "tuotteet")
 
 @app.route("/<int:product_id>")
 def product_json(product_id):
@@ -174,19 +242,16 @@ def create():
                               tilaus_id)
                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                   """
-        redirect_url = product_form_submit(conn, command)
+        redirect_url = product_form_submit(command)
         if redirect_url:
             flash('Lisättiin tuote "{}".'.format(request.form["kuvaus"]),
                   "alert-success")
             return redirect_url
 
-    tilat = conn.execute("SELECT * FROM Tilat").fetchall()
-    sijainnit = conn.execute("SELECT * FROM Sijainnit").fetchall()
-    tilaukset = conn.execute(
-        "SELECT * FROM Tilaukset LEFT JOIN Asiakkaat ON Tilaukset.asiakas_id "
-        "= Asiakkaat.id WHERE Tilaukset.arkistoitu = 0").fetchall()
-    return render_template("products/create.html", tilat=tilat,
-                           sijainnit=sijainnit, tilaukset=tilaukset)
+    return render_template("products/create.html",
+                           tilat=lookups.tilat(conn),
+                           sijainnit=lookups.sijainnit(conn),
+                           tilaukset=get_chosen_order(conn))
 
 @app.route("/<int:product_id>/edit", methods=("GET", "POST"))
 def edit(product_id):
@@ -206,39 +271,31 @@ def edit(product_id):
                     tilaus_id = ?
                   WHERE id = ?
                   """
-        redirect_url = product_form_submit(conn, command, product_id)
+        redirect_url = product_form_submit(command, product_id)
         if redirect_url:
             flash('Muokattiin tuotetta "{}".'.format(request.form["kuvaus"]),
                   "alert-success")
             return redirect_url
 
     product = get_product(product_id)
-    tilat = conn.execute("SELECT * FROM Tilat").fetchall()
-    sijainnit = conn.execute("SELECT * FROM Sijainnit").fetchall()
-    tilaukset = conn.execute(
-        "SELECT * FROM Tilaukset LEFT JOIN Asiakkaat ON "
-        "Tilaukset.asiakas_id = Asiakkaat.id WHERE Tilaukset.arkistoitu = 0 "
-        "ORDER BY Tilaukset.id DESC").fetchall()
-    return render_template("products/edit.html", product=product, tilat=tilat,
-                           sijainnit=sijainnit, tilaukset=tilaukset)
+    return render_template("products/edit.html", product=product,
+                           tilat=lookups.tilat(conn),
+                           sijainnit=lookups.sijainnit(conn),
+                           tilaukset=get_chosen_order(conn, product))
 
 @app.route("/<int:product_id>/archive", methods=("POST",))
 def archive(product_id):
     product = get_product(product_id)
-    conn = get_db_connection()
-    conn.execute("UPDATE tuotteet SET arkistoitu = ? WHERE id = ?",
-                 (1, product_id))
-    conn.commit()
+    get_writer().execute("UPDATE tuotteet SET arkistoitu = ? WHERE id = ?",
+                         (1, product_id))
     flash('Arkistoitiin tuote "{}".'.format(product["kuvaus"]), "alert-warning")
     return redirect(url_for("index"))
 
 @app.route("/<int:product_id>/unarchive", methods=("POST",))
 def unarchive(product_id):
     product = get_product(product_id)
-    conn = get_db_connection()
-    conn.execute("UPDATE tuotteet SET arkistoitu = ? WHERE id = ?",
-                 (0, product_id))
-    conn.commit()
+    get_writer().execute("UPDATE tuotteet SET arkistoitu = ? WHERE id = ?",
+                         (0, product_id))
     flash('Palautettiin tuote "{}" arkistosta.'.format(product["kuvaus"]),
           "alert-warning")
     return redirect(url_for("index"))
@@ -0,0 +1,104 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""Single-writer queue for database modifications."""
+
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+class Writer:
+    """Run write jobs one at a time in a dedicated thread.
+
+    A job is a callable that takes a connection and performs its
+    modifications without committing. Jobs that are queued while a
+    transaction is running are committed together in the next one, each
+    inside its own savepoint so that a failing job doesn't affect the
+    others. Readers keep using their own connections on WAL snapshots.
+    """
+
+    def __init__(self, connect, max_batch=32):
+        self.connect = connect
+        self.max_batch = max_batch
+        self.batches = 0
+        self.jobs = 0
+        self.last_batch_size = 0
+        self.largest_batch_size = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="Writer",
+                                        daemon=True)
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, job) -> Future:
+        """Queue a job and return a future for its result."""
+        future = Future()
+        self._queue.put((job, future))
+        return future
+
+    def run(self, job):
+        """Run a job and wait until it has been committed."""
+        return self.submit(job).result()
+
+    def execute(self, sql, parameters=()):
+        """Run a single statement and return the number of changed rows."""
+        return self.run(lambda conn: conn.execute(sql, parameters).rowcount)
+
+    def stats(self) -> str:
+        return (f"queue depth {self.queue_depth}, {self.batches} batches, "
+                f"{self.jobs} jobs, last batch {self.last_batch_size}, "
+                f"largest batch {self.largest_batch_size}")
+
+    def _run(self):
+        conn = self.connect()
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(conn, batch)
+
+    def _commit(self, conn, batch):
+        outcomes = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for job, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = job(conn)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    outcomes.append((future, None, e))
+                else:
+                    outcomes.append((future, result, None))
+                conn.execute("RELEASE job")
+            conn.commit()
+        except Exception as e:
+            logger.exception("Write transaction failed.")
+            if conn.in_transaction:
+                conn.rollback()
+            for job, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result, exception in outcomes:
+            if exception is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exception)
+        self.batches += 1
+        self.jobs += len(batch)
+        self.last_batch_size = len(batch)
+        self.largest_batch_size = max(self.largest_batch_size, len(batch))
+        logger.debug(f"Writer committed {len(batch)} jobs; {self.stats()}")
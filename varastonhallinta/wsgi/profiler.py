@@ -0,0 +1,103 @@
+# Copyright 2021 Okko Hartikainen <okko.hartikainen@gmail.com>
+#
+# This work is licensed under the GNU GPLv3 only. See LICENSE.
+
+"""WSGI middleware for profiling requests."""
+
+import cProfile
+import itertools
+import logging
+import os
+import pathlib
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class ProfilerMiddleware:
+    """Profile every nth request whose path matches a pattern.
+
+    Each profile is written to the directory as a pstats file, which can
+    be read with pstats or turned into a flame graph with e.g. flameprof.
+    Streamed response bodies are profiled until the server closes them.
+    Only one request is profiled at a time, as a profiler is process-wide
+    on newer Pythons, and requests chosen meanwhile pass through
+    unprofiled.
+    """
+
+    def __init__(self, app, directory, every=1, route=None):
+        self.app = app
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.every = every
+        self.route = re.compile(route) if route is not None else None
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._profiling = threading.Lock()  # held until the body is closed
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if self.route is not None and not self.route.search(path):
+            return self.app(environ, start_response)
+        with self._lock:
+            n = next(self._counter)
+        if n % self.every or not self._profiling.acquire(blocking=False):
+            return self.app(environ, start_response)
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                body = self.app(environ, start_response)
+            finally:
+                profile.disable()
+        except BaseException:
+            self._profiling.release()
+            raise
+        return ProfiledBody(body, profile, self.dump,
+                            (n, environ.get("REQUEST_METHOD", ""), path,
+                             started))
+
+    def dump(self, profile, n, method, path, started):
+        try:
+            elapsed = time.perf_counter() - started
+            slug = re.sub(r"\W+", "_", path).strip("_") or "root"
+            filename = self.directory / (
+                f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{n}-"
+                f"{method}-{slug}-{elapsed*1000:.0f}ms.prof")
+            profile.dump_stats(filename)
+        finally:
+            self._profiling.release()
+        logger.debug(f"Wrote profile of {method} {path} to {filename}.")
+
+class ProfiledBody:
+    """Response body that profiles its iteration and dumps on close."""
+
+    def __init__(self, body, profile, dump, request):
+        self.body = body
+        self.iterator = iter(body)
+        self.profile = profile
+        self._dump = dump
+        self.request = request
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.profile.enable()
+        try:
+            return next(self.iterator)
+        finally:
+            self.profile.disable()
+
+    def close(self):
+        try:
+            if hasattr(self.body, "close"):
+                self.profile.enable()
+                try:
+                    self.body.close()
+                finally:
+                    self.profile.disable()
+        finally:
+            self._dump(self.profile, *self.request)
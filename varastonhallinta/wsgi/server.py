@@ -5,36 +5,214 @@
 """WSGI server startup wrapper."""
 
 import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import pathlib
+import re
+import secrets
+import signal
+import sys
+import threading
+import time
+from collections import Counter
 from contextlib import redirect_stdout
 from paste.translogger import TransLogger  # middleware for logging requests
-from waitress import serve
-from wsgi.application.flask_app import app
+from waitress import create_server
+from wsgi.application import assets, metrics
+from wsgi.application.backups import Scheduler
+from wsgi.application.changelog import Rotation
+from wsgi.application.flask_app import app, get_writer
+from wsgi.profiler import ProfilerMiddleware
+
+ACCESS_LOG_RATE = 20  # lines per second before the rest are summarized
+
+class AccessLogLimiter(logging.Filter):
+    """Pass a limited number of access log lines per second.
+
+    Lines over the limit are counted by status code, and the counts are
+    logged as one summary line when the next second's first line passes.
+    """
+
+    STATUS = re.compile(r'" (\d{3}) ')
+
+    def __init__(self, rate=ACCESS_LOG_RATE):
+        super().__init__()
+        self.rate = rate
+        self.second = None
+        self.passed = 0
+        self.suppressed = Counter()
+        self.lock = threading.Lock()
+        self.summary = logging.getLogger("translogger.summary")
+
+    def filter(self, record) -> bool:
+        second = int(time.monotonic())
+        with self.lock:
+            suppressed = None
+            if second != self.second:
+                self.second, self.passed = second, 0
+                suppressed, self.suppressed = self.suppressed, Counter()
+            passed = self.passed < self.rate
+            if passed:
+                self.passed += 1
+            else:
+                match = self.STATUS.search(record.getMessage())
+                self.suppressed[match[1] if match else "?"] += 1
+        if suppressed:
+            counts = ", ".join(f"{status}: {count}" for status, count
+                               in sorted(suppressed.items()))
+            self.summary.info(f"Skipped {sum(suppressed.values())} access "
+                              f"log lines ({counts}).")
+        return passed
 
 def wsgi_server(sockets, database, translogger=False, dev=False,
-                configurer=None):
-    """Start WSGI server."""
+                configurer=None, pragmas=None, cached_statements=256,
+                changelog_database=None, changelog_retention=None,
+                changelog_archive=None, slow_query=None, threads=6,
+                connection_limit=100, backlog=1024, channel_timeout=120,
+                backup_interval=None, backup_directory=None, backup_keep=7,
+                backup_step=1024, backup_vacuum=False, backup_verify=False,
+                profile=None, profile_every=1, profile_route=None,
+                worker=None, secret_key=None, ready=None):
+    """Start WSGI server.
+
+    A worker number is given when the server runs under prefork_server.
+    Once the server accepts requests, the durations of its startup phases
+    are sent to the ready connection.
+    """
+    started = time.perf_counter()
     if configurer is not None:
         configurer()
     logger = logging.getLogger(__name__)
+    if worker is not None:
+        threading.Thread(target=exit_with_parent, name="Parent watch",
+                         daemon=True).start()
+    # Exit through exit handlers on terminate(), so that logs get sent.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
 
     app.config["database"] = database
+    if secret_key is not None:
+        app.config["SECRET_KEY"] = secret_key
+    if pragmas is not None:
+        app.config["pragmas"] = pragmas
+    app.config["cached_statements"] = cached_statements
+    app.config["changelog_database"] = changelog_database
+    if slow_query is not None:
+        metrics.slow_query_threshold = slow_query/1000
+    if changelog_retention is not None and not worker:
+        if changelog_archive is None:
+            changelog_archive = pathlib.Path(database).parent / "muutosloki"
+        Rotation(get_writer(), changelog_retention, changelog_archive).start()
+        logger.info(f"Archiving change log entries older than "
+                    f"{changelog_retention} days to {changelog_archive}.")
+    if backup_interval is not None and not worker:
+        if backup_directory is None:
+            backup_directory = pathlib.Path(database).parent / "varmuuskopiot"
+        Scheduler(database, backup_directory, backup_interval*60*60,
+                  backup_keep, backup_step, backup_vacuum,
+                  backup_verify).start()
+        logger.info(f"Backing up database every {backup_interval} hours to "
+                    f"{backup_directory}, keeping {backup_keep} backups.")
     if dev:
         app.debug = True
         logger.info("Flask debug mode enabled.")
+    else:
+        threading.Thread(target=assets.precompress, name="Precompress",
+                         daemon=True).start()
+
+    wsgi_app = app
+    if profile is not None:
+        wsgi_app = ProfilerMiddleware(wsgi_app, profile, profile_every,
+                                      profile_route)
+        logger.info(f"Profiling 1 in {profile_every} requests"
+                    + (f" matching {profile_route}" if profile_route else "")
+                    + f", writing to {profile}.")
 
     if translogger:
         log_format = ('%(REMOTE_ADDR)s - %(REMOTE_USER)s "%(REQUEST_METHOD)s '
                       '%(REQUEST_URI)s %(HTTP_VERSION)s" %(status)s %(bytes)s '
                       '"%(HTTP_REFERER)s" "%(HTTP_USER_AGENT)s"')
-        wsgi_app = TransLogger(app,
+        wsgi_app = TransLogger(wsgi_app,
                                setup_console_handler=False,
                                format=log_format,
                                logger_name="translogger")
-    else:
-        wsgi_app = app
+        logging.getLogger("translogger").addFilter(AccessLogLimiter())
 
     # Redirect waitress stdout to log, start waitress.
     logger = logging.getLogger("waitress")
     logging.write = lambda msg: logger.info(msg) if msg != "\n" else None
     with redirect_stdout(logging):
-        serve(wsgi_app, sockets=sockets, threads=6)
+        configured = time.perf_counter()
+        server = create_server(wsgi_app, sockets=sockets, threads=threads,
+                               connection_limit=connection_limit,
+                               backlog=backlog,
+                               channel_timeout=channel_timeout)
+        server.print_listen("Serving on http://{}:{}")
+        if ready is not None:
+            ready.send({"setup": configured - started,
+                        "waitress": time.perf_counter() - configured})
+            ready.close()
+        server.run()
+
+def exit_with_parent():
+    """Exit when the supervising process is gone, however it ended."""
+    parent = multiprocessing.parent_process()
+    multiprocessing.connection.wait([parent.sentinel])
+    logging.shutdown()  # os._exit skips exit handlers
+    os._exit(1)
+
+def prefork_server(sockets, database, translogger=False, dev=False,
+                   configurer=None, workers=2, **kwargs):
+    """Run WSGI servers in worker processes that share the sockets.
+
+    Each worker has its own threads and interpreter lock, so CPU-bound
+    requests can use several cores. Workers that exit are started again,
+    after a growing delay if they keep exiting soon after starting. Only
+    the first worker runs periodic maintenance. Only the initial workers
+    report to the ready connection.
+    """
+    if configurer is not None:
+        configurer()
+    logger = logging.getLogger(__name__)
+    kwargs.setdefault("secret_key", secrets.token_urlsafe(16))  # shared
+    ready = kwargs.pop("ready", None)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit())
+    processes = {}  # worker number => (process, start time)
+    delays = dict.fromkeys(range(workers), 0)
+
+    def start(worker, ready=None):
+        process = multiprocessing.Process(
+            target=wsgi_server, name=f"Worker-{worker}",
+            args=(sockets, database, translogger, dev, configurer),
+            kwargs=dict(kwargs, worker=worker, ready=ready))
+        process.start()
+        processes[worker] = (process, time.monotonic())
+        logger.debug(f"Started worker {worker} (pid {process.pid}).")
+
+    try:
+        for worker in range(workers):
+            start(worker, ready)
+        if ready is not None:
+            ready.close()  # restarted workers don't report
+        logger.info(f"Serving with {workers} worker processes.")
+        while True:
+            sentinels = {process.sentinel: worker
+                         for worker, (process, _) in processes.items()}
+            for sentinel in multiprocessing.connection.wait(sentinels):
+                worker = sentinels[sentinel]
+                process, started = processes.pop(worker)
+                process.join()
+                if time.monotonic() - started < 10:
+                    delays[worker] = min(max(1, 2*delays[worker]), 60)
+                else:
+                    delays[worker] = 0
+                logger.error(f"Worker {worker} exited with code "
+                             f"{process.exitcode}, restarting in "
+                             f"{delays[worker]} s.")
+                time.sleep(delays[worker])
+                start(worker)
+    finally:
+        for process, _ in processes.values():
+            process.terminate()
+        for process, _ in processes.values():
+            process.join()